@@ -0,0 +1,104 @@
+from time import perf_counter
+import random
+import networkx as nx
+import numpy as np
+from coloring_algorithms import DENSE_AVERAGE_DEGREE, largest_first
+from coloring_algorithms import largest_first_with_interchange, d_satur_with_interchange
+from local_search import _tabucol
+from relabeling import CompactColoring, color_dtype, relabel
+
+# phases that can not be stopped, run after largest_first while they are expected
+# to end before the deadline, with expected time relative to time of largest_first
+# (the biggest ratios measured on G(n, p) graphs with some margin)
+PHASES = [
+    ("interchange", largest_first_with_interchange, 5),
+    ("d_satur", d_satur_with_interchange, 10),
+]
+# setting up tabucol (arrays of conflicts of every node and color, removal of the first
+# color) relative to time of largest_first, measured up to 0.2 on sparse graphs (colored
+# node by node) and up to 2 on dense ones (colored with numpy), with some margin
+LOCAL_SEARCH_SETUP = {"sparse": 0.5, "dense": 4}
+
+
+def anytime_coloring(
+    G, time_limit=1.0, callback=None, target=None, rng=None, trace=None
+):
+    """
+    Colors G (networkx or graph.Graph) in time_limit seconds. The first coloring comes
+    from largest_first (it is always made, even after the deadline), then it is
+    improved by PHASES (each only when it is expected to end before the deadline)
+    and by tabucol until the deadline or until target colors are used (it is
+    started only when LOCAL_SEARCH_SETUP is expected to end before the deadline).
+    The best coloring found so far is kept, so running out of time loses nothing.
+    callback(elapsed, colors, phase) is called with the number of colors of the best
+    coloring after every phase and every improvement of local search, when it returns
+    True coloring stops. rng (random.Random) is used by local search. trace records
+    the first coloring (largest_first) node by node.
+    Returns the best coloring (CompactColoring when it is kept in array, so no dict of
+    all nodes is built after the deadline) and number of its colors.
+    """
+    start = perf_counter()
+    deadline = start + time_limit
+    graph, labels = relabel(G)  # colorings of graph are by nodes 0..n-1
+    target = 1 if target is None else target
+    rng = random if rng is None else rng
+
+    first_start = perf_counter()  # conversion of G is not a part of it
+    best, best_colors = largest_first(graph, trace=trace)
+    first_time = perf_counter() - first_start
+    stop = callback is not None and callback(
+        perf_counter() - start, best_colors, "largest_first"
+    )
+
+    for phase, coloring_func, relative_time in PHASES:
+        if stop or best_colors <= target:
+            break
+        if perf_counter() + first_time * relative_time > deadline:
+            continue
+        coloring, number_of_colors_used = coloring_func(graph)
+        if number_of_colors_used < best_colors:
+            best, best_colors = coloring, number_of_colors_used
+        if callback is not None:
+            stop = callback(perf_counter() - start, best_colors, phase)
+
+    # tabucol removes one color at a time, every removed color is reported, it checks
+    # deadline all the time, but its setup and removal of a color can not be stopped
+    dense = 2 * graph.number_of_edges() >= DENSE_AVERAGE_DEGREE * len(graph)
+    setup_time = first_time * LOCAL_SEARCH_SETUP["dense" if dense else "sparse"]
+    if not stop and best_colors > target and perf_counter() + setup_time <= deadline:
+
+        def report(number_of_colors):
+            if callback is not None:
+                return callback(perf_counter() - start, number_of_colors, "local_search")
+
+        if isinstance(best, CompactColoring):
+            colors = best.colors.astype(np.int64)
+        else:  # greedy colorings of sparse graphs are dicts of nodes 0..n-1
+            colors = np.fromiter((best[node] for node in graph), np.int64, len(graph))
+        colors, best_colors = _tabucol(
+            graph, colors, deadline, target, rng, callback=report
+        )
+        best = CompactColoring(colors.astype(color_dtype(best_colors)))
+
+    if labels is not None:  # back to nodes of G, array colorings without a dict
+        if isinstance(best, CompactColoring):
+            best = CompactColoring(best.colors, labels)
+        else:
+            best = {labels[node]: color for node, color in best.items()}
+    return best, best_colors
+
+
+if __name__ == "__main__":
+    G = nx.gnp_random_graph(1000, 0.5, seed=2137)
+    for time_limit in [0.01, 0.5, 5.0]:
+        print(f"time limit {time_limit}s:")
+        coloring, number_of_colors_used = anytime_coloring(
+            G,
+            time_limit,
+            lambda elapsed, colors, phase: print(f"    {elapsed:.3f}s {phase}: {colors} colors"),
+            rng=random.Random(2137),
+        )
+        for edge in G.edges():
+            assert (
+                coloring[edge[0]] != coloring[edge[1]]
+            ), "anytime_coloring created invalid coloring, two adjacent nodes have the same color"
@@ -0,0 +1,203 @@
+"""
+Sweeps of coloring algorithms over graphs on a pool of processes.
+
+python batch_runner.py [--lower-bound]    sweep of all algorithms over G(1000, p) graphs
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+from multiprocessing import Pool
+from coloring_cache import fingerprint
+from graph import Graph
+from lower_bounds import lower_bound as chromatic_lower_bound
+from wrapper import wrapper
+
+# file of saved graph with fingerprint of the graph, saved graph is reused only
+# when it is the same graph
+FINGERPRINT_FILE = "fingerprint.txt"
+
+# graphs opened by worker process, graph name -> Graph with memory-mapped arrays
+_worker_graphs = {}
+_worker_graph_directories = {}
+_worker_graph_fingerprints = {}
+_worker_lower_bounds = {}  # graph name -> lower bound (only with lower_bound=True)
+
+
+def run_batch(
+    graphs, functions, seeds, results_path, work_dir=None, processes=None, lower_bound=False
+):
+    """
+    Colors every graph with every coloring function for every seed on a pool of processes.
+    graphs is a dict name:graph (networkx or graph.Graph), functions are coloring
+    functions like the ones from coloring_algorithms.
+    With lower_bound=True results have lower bound on chromatic number and optimality
+    gap, the bound of every graph is computed once here (it often takes longer than
+    coloring) and passed to workers.
+    Results are yielded as dicts as soon as jobs finish and appended to results_path
+    as json lines, jobs that are already in results_path for the same graph (by its
+    fingerprint) are skipped, so interrupted sweep can be resumed by calling run_batch
+    again with the same arguments.
+    """
+    if work_dir is None:
+        work_dir = results_path + ".graphs"
+
+    # graphs are written to disk once and memory-mapped by workers,
+    # so they are not pickled for every job
+    graph_directories = {}
+    graph_fingerprints = {}
+    for name, G in graphs.items():
+        directory = os.path.join(work_dir, str(name))
+        if not isinstance(G, Graph):
+            G = Graph.from_networkx(G)
+        graph_fingerprint = fingerprint(G)
+        if _saved_fingerprint(directory) != graph_fingerprint:
+            _save_graph(G, directory, graph_fingerprint)
+        graph_directories[name] = directory
+        graph_fingerprints[name] = graph_fingerprint
+
+    done = _finished_jobs(results_path)
+    jobs = [
+        (function, name, seed)
+        for name in graphs
+        for function in functions
+        for seed in seeds
+        if (function.__name__, str(name), graph_fingerprints[name], seed) not in done
+    ]
+    if not jobs:
+        return
+    lower_bounds = {}
+    if lower_bound:
+        for name in {name for _, name, _ in jobs}:
+            lower_bounds[name] = chromatic_lower_bound(graphs[name])
+
+    with open(results_path, "a") as results_file, Pool(
+        processes,
+        initializer=_init_worker,
+        initargs=(graph_directories, graph_fingerprints, lower_bounds),
+    ) as pool:
+        for result in pool.imap_unordered(_run_job, jobs):
+            results_file.write(json.dumps(result) + "\n")
+            results_file.flush()
+            yield result
+
+
+def _saved_fingerprint(directory):
+    try:
+        with open(os.path.join(directory, FINGERPRINT_FILE)) as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
+
+
+def _save_graph(G, directory, graph_fingerprint):
+    """
+    Saves G to directory (replacing anything there) with its fingerprint. The graph is
+    written to a temporary directory that is moved into place when complete, so
+    interrupted save never leaves a directory that looks like a saved graph.
+    """
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    temporary = tempfile.mkdtemp(dir=parent, prefix=".saving_")
+    G.save(temporary)
+    with open(os.path.join(temporary, FINGERPRINT_FILE), "w") as file:
+        file.write(graph_fingerprint)
+    # directory can not be replaced while it is not empty, old one is moved away first
+    if os.path.exists(directory):
+        old = tempfile.mkdtemp(dir=parent, prefix=".old_")
+        os.replace(directory, os.path.join(old, "graph"))
+        os.replace(temporary, directory)
+        shutil.rmtree(old)
+    else:
+        os.replace(temporary, directory)
+
+
+def _finished_jobs(results_path):
+    done = set()
+    if not os.path.exists(results_path):
+        return done
+    with open(results_path) as results_file:
+        for line in results_file:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:  # last line of interrupted run
+                continue
+            # rows written before fingerprints were stored never match
+            key = (result["algorithm"], result["graph"], result.get("fingerprint"))
+            done.add(key + (result["seed"],))
+    return done
+
+
+def _init_worker(graph_directories, graph_fingerprints, lower_bounds):
+    _worker_graph_directories.update(graph_directories)
+    _worker_graph_fingerprints.update(graph_fingerprints)
+    _worker_lower_bounds.update(lower_bounds)
+
+
+def _run_job(job):
+    function, name, seed = job
+    if name not in _worker_graphs:
+        _worker_graphs[name] = Graph.load(_worker_graph_directories[name])
+    G = _worker_graphs[name]
+    lower_bound = _worker_lower_bounds.get(name, False)
+
+    random.seed(seed)
+    coloring, number_of_colors_used, time, timing_dict = wrapper(
+        function, G, report=False, trace_every=None, lower_bound=lower_bound
+    )
+    result = {
+        "algorithm": function.__name__,
+        "graph": str(name),
+        "fingerprint": _worker_graph_fingerprints[name],
+        "seed": seed,
+        "colors": number_of_colors_used,
+        "time": time,
+        "nodes": len(G),
+    }
+    if lower_bound is not False:
+        result["lower_bound"] = timing_dict["lower_bound"]
+        result["gap"] = timing_dict["gap"]
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--lower-bound",
+        action="store_true",
+        help="include lower bound and optimality gap in results (it is slow)",
+    )
+    arguments = parser.parse_args()
+
+    from coloring_algorithms import random_sequential, random_sequential_with_interchange
+    from coloring_algorithms import largest_first, largest_first_with_interchange
+    from coloring_algorithms import smallest_last, smallest_last_with_interchange
+    from coloring_algorithms import d_satur, d_satur_with_interchange
+    from graph_factory import generate
+
+    function_list = [
+        random_sequential,
+        random_sequential_with_interchange,
+        largest_first,
+        largest_first_with_interchange,
+        smallest_last,
+        smallest_last_with_interchange,
+        d_satur,
+        d_satur_with_interchange,
+    ]
+    graphs = {
+        f"gnp_1000_{p}": generate("gnp", 1000, p=p, seed=2137)
+        for p in [0.1, 0.3, 0.5, 0.7, 0.9]
+    }
+
+    for result in run_batch(
+        graphs,
+        function_list,
+        range(5),
+        "batch_results.jsonl",
+        lower_bound=arguments.lower_bound,
+    ):
+        print(result)
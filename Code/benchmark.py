@@ -0,0 +1,284 @@
+"""
+Benchmark suite for coloring algorithms.
+
+python benchmark.py run [--quick]        records results of current commit
+python benchmark.py compare BASE NEW     flags regressions of NEW against BASE
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import tracemalloc
+from datetime import datetime
+from time import perf_counter
+import networkx as nx
+import coloring_algorithms
+
+RESULTS_PATH = "benchmark_results.json"
+
+ALGORITHMS = [
+    "random_sequential",
+    "random_sequential_with_interchange",
+    "largest_first",
+    "largest_first_with_interchange",
+    "smallest_last",
+    "smallest_last_with_interchange",
+    "d_satur",
+    "d_satur_with_interchange",
+]
+
+NETWORKX_STRATEGIES = [
+    "largest_first",
+    "random_sequential",
+    "smallest_last",
+    "independent_set",
+    "connected_sequential_bfs",
+    "connected_sequential_dfs",
+    "saturation_largest_first",
+]
+
+# family name -> function creating graph with n nodes from seed
+FAMILIES = {
+    "gnp_sparse": lambda n, seed: nx.gnp_random_graph(n, 10 / n, seed=seed),
+    "gnp_dense": lambda n, seed: nx.gnp_random_graph(n, 0.5, seed=seed),
+    "random_regular": lambda n, seed: nx.random_regular_graph(6, n, seed=seed),
+    "power_law": lambda n, seed: nx.barabasi_albert_graph(n, 4, seed=seed),
+    "grid": lambda n, seed: nx.convert_node_labels_to_integers(
+        nx.grid_2d_graph(int(math.sqrt(n)), int(math.sqrt(n)))
+    ),
+}
+
+SIZES = [500, 2000]
+QUICK_SIZES = [200]
+
+
+def networkx_coloring(strategy):
+    """
+    Wraps networkx.greedy_color so it has the same interface as our algorithms.
+    """
+
+    def color(G, trace=None):
+        coloring = nx.greedy_color(G, strategy)
+        return coloring, max(coloring.values(), default=-1) + 1
+
+    color.__name__ = f"networkx_{strategy}"
+    return color
+
+
+def all_functions():
+    functions = [getattr(coloring_algorithms, name) for name in ALGORITHMS]
+    functions += [networkx_coloring(strategy) for strategy in NETWORKX_STRATEGIES]
+    return functions
+
+
+def measure(function, G, repetitions, seed=0):
+    """
+    Returns list of wall times, peak memory in bytes and number of colors used.
+    Memory is measured in a separate run, because tracemalloc slows everything down.
+    """
+    times = []
+    for _ in range(repetitions):
+        random.seed(seed)
+        start = perf_counter()
+        _, number_of_colors_used = function(G)
+        times.append(perf_counter() - start)
+
+    random.seed(seed)
+    tracemalloc.start()
+    function(G)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return times, peak_memory, number_of_colors_used
+
+
+def run(sizes, repetitions, results_path=RESULTS_PATH):
+    results = []
+    for family, generate in FAMILIES.items():
+        for n in sizes:
+            G = generate(n, 2137)
+            for function in all_functions():
+                times, peak_memory, colors = measure(function, G, repetitions)
+                results.append(
+                    {
+                        "algorithm": function.__name__,
+                        "family": family,
+                        "nodes": len(G),
+                        "times": times,
+                        "peak_memory": peak_memory,
+                        "colors": colors,
+                    }
+                )
+                print(
+                    f"{family:>15} {len(G):>6} {function.__name__:>40} "
+                    f"{min(times):8.4f}s {peak_memory / 2**20:8.2f}MB {colors:>4} colors"
+                )
+
+    all_results = _load(results_path)
+    all_results[current_commit()] = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "results": results,
+    }
+    with open(results_path, "w") as file:
+        json.dump(all_results, file, indent=1)
+
+
+def compare(base, new, results_path=RESULTS_PATH, alpha=0.01, threshold=0.05):
+    """
+    Prints comparison of two runs and returns list of regressions. Time regression
+    is flagged when Mann-Whitney U test finds NEW slower with p < alpha and median
+    time grew by more than threshold, memory and colors when they grew by more than threshold.
+    With too few repetitions p can never be below alpha, then growth of median time
+    by more than threshold is flagged as TIME? (untested) regression and a warning
+    is printed, so such comparison is never reported as clean.
+    """
+    all_results = _load(results_path)
+    base_results = {_key(r): r for r in all_results[_resolve(all_results, base)]["results"]}
+    new_results = {_key(r): r for r in all_results[_resolve(all_results, new)]["results"]}
+
+    regressions = []
+    untestable = 0
+    for key in sorted(base_results.keys() & new_results.keys()):
+        old, current = base_results[key], new_results[key]
+        time_ratio = _median(current["times"]) / _median(old["times"])
+        memory_ratio = current["peak_memory"] / max(old["peak_memory"], 1)
+        p_value = mann_whitney_p_value(current["times"], old["times"])
+        testable = smallest_p_value(len(current["times"]), len(old["times"])) < alpha
+        untestable += not testable
+
+        flags = []
+        if time_ratio > 1 + threshold:
+            if not testable:
+                flags.append("TIME?")
+            elif p_value < alpha:
+                flags.append("TIME")
+        if memory_ratio > 1 + threshold:
+            flags.append("MEMORY")
+        if current["colors"] > old["colors"]:
+            flags.append("COLORS")
+        if flags:
+            regressions.append((key, flags))
+
+        print(
+            f"{key[1]:>15} {key[2]:>6} {key[0]:>40} time {time_ratio:6.2f}x "
+            f"(p={p_value:.3f}) memory {memory_ratio:6.2f}x "
+            f"colors {old['colors']}->{current['colors']} {' '.join(flags)}"
+        )
+
+    if untestable:
+        print(
+            f"warning: with these repetitions p-value of {untestable} comparisons can "
+            f"not be below alpha={alpha}, their times were not tested, run with more "
+            "--repetitions"
+        )
+    print(f"{len(regressions)} regressions found")
+    return regressions
+
+
+def smallest_p_value(n1, n2):
+    """
+    Returns the smallest p-value mann_whitney_p_value can give for samples of sizes
+    n1 and n2, when all samples are bigger than all reference values.
+    """
+    return mann_whitney_p_value(list(range(n2, n2 + n1)), list(range(n2)))
+
+
+def mann_whitney_p_value(samples, reference):
+    """
+    One-sided p-value of Mann-Whitney U test that samples tend to be bigger than
+    reference, normal approximation with tie correction.
+    """
+    n1, n2 = len(samples), len(reference)
+    combined = sorted([(x, 0) for x in samples] + [(x, 1) for x in reference])
+
+    # average ranks of tied values
+    ranks = [0.0] * len(combined)
+    tie_correction = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tie_correction += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_correction / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)  # with continuity correction
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def current_commit():
+    repository = os.path.dirname(os.path.abspath(__file__))
+    commit = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        capture_output=True,
+        text=True,
+        cwd=repository,
+    ).stdout.strip()
+    dirty = subprocess.run(
+        ["git", "status", "--porcelain", "--untracked-files=no"],
+        capture_output=True,
+        text=True,
+        cwd=repository,
+    ).stdout.strip()
+    return commit + "-dirty" if dirty else commit
+
+
+def _resolve(all_results, commit):
+    # allows both full and abbreviated commit hashes
+    if commit in all_results:
+        return commit
+    matches = [key for key in all_results if key.startswith(commit)]
+    assert len(matches) == 1, f"no single run found for commit {commit}"
+    return matches[0]
+
+
+def _key(result):
+    return result["algorithm"], result["family"], result["nodes"]
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+
+def _load(results_path):
+    try:
+        with open(results_path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--results", default=RESULTS_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("--quick", action="store_true")
+    run_parser.add_argument("--repetitions", type=int, default=7)
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--alpha", type=float, default=0.01)
+    arguments = parser.parse_args()
+
+    if arguments.command == "run":
+        sizes = QUICK_SIZES if arguments.quick else SIZES
+        run(sizes, arguments.repetitions, arguments.results)
+    else:
+        regressions = compare(
+            arguments.base, arguments.new, arguments.results, arguments.alpha
+        )
+        raise SystemExit(1 if regressions else 0)
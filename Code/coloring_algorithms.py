@@ -1,12 +1,26 @@
+from array import array
 from collections import defaultdict
+from heapq import heapify, heappop, heappush
 from networkx import Graph
+import numpy as np
 import random
+from time import perf_counter
+from graph import Graph as CSRGraph
+from relabeling import CompactColoring, color_dtype
 
+# average degree from which _greedy switches to numpy kernel
+DENSE_AVERAGE_DEGREE = 128
 
-def _greedy(G: Graph, order: list, color_with_interchange=False):
+
+def _greedy(
+    G: Graph, order: list, color_with_interchange=False, trace=None, interchange=None
+):
     """
     A greedy coloring algorithm for coloring the nodes of a graph G in order given by list order.
     returns coloring and number of used colors
+    trace is an optional tracing.Trace that records progress of coloring
+    interchange is the function used when new color is needed (by default
+    try_interchanging_colors), for example KempeInterchange
     """
 
     # if order is empty then return 0
@@ -20,137 +34,526 @@ def _greedy(G: Graph, order: list, color_with_interchange=False):
         set(order)
     ), "incorrect order provided, some nodes appear more than one"
 
-    node_colors = {}  # A dictionary to keep track of the color assigned to each node
-    max_color = 1  # additional variable to help with interchange of colors
-
+    # numpy kernel costs a few microseconds per node no matter the degree, so
+    # it pays off only on dense graphs, sparse ones are colored with dicts
+    # (as well as ones colored with other interchange than the default one)
+    if (
+        2 * G.number_of_edges() < DENSE_AVERAGE_DEGREE * len(G)
+        or interchange is not None
+    ):
+        node_colors = {}  # A dictionary to keep track of the color assigned to each node
+        max_color = 1  # additional variable to help with interchange of colors
+
+        # Iterate over the nodes of the graph in given order
+        for step, node in enumerate(order):
+            if trace is not None:
+                trace.node(step)
+            node_colors, max_color = color_node(
+                G,
+                node,
+                node_colors,
+                max_color,
+                color_with_interchange,
+                trace,
+                step,
+                interchange,
+            )
+
+        return node_colors, max(node_colors.values())
+
+    # colors are kept in arrays, so work on CSR graph with nodes 0..n-1
+    if isinstance(G, CSRGraph):
+        graph, indices = G, order
+    else:
+        graph = CSRGraph.from_networkx(G)
+        indices = order
+        if graph.labels is not None:
+            index = {node: i for i, node in enumerate(graph.labels)}
+            indices = [index[node] for node in order]
+
+    coloring = _ArrayColoring(graph, color_with_interchange)
     # Iterate over the nodes of the graph in given order
-    for node in order:
-        node_colors, max_color = color_node(
-            G, node, node_colors, max_color, color_with_interchange
-        )
+    for step, node in enumerate(indices):
+        if trace is not None:
+            trace.node(step)
+        coloring.color(node, trace, step)
+
+    number_of_colors_used = int(coloring.colors.max())
+    if graph is G:  # colors of nodes 0..n-1 are handed back as they are
+        return coloring.compact(number_of_colors_used), number_of_colors_used
+    node_colors = dict(zip(order, coloring.colors[indices].tolist()))
+    return node_colors, number_of_colors_used
+
+
+class _ArrayColoring:
+    """
+    Colors nodes of CSR graph one by one in any order with the smallest free color
+    (and interchange of try_interchanging_colors when new color is needed), colors
+    are kept in numpy array, so choosing a color costs a few numpy calls whatever
+    the degree of the node is. Used on dense graphs.
+    """
+
+    __slots__ = [
+        "graph",
+        "color_with_interchange",
+        "colors",
+        "used",
+        "neighbor_colors",
+        "is_free",
+        "max_color",
+        "counts",
+    ]
+
+    def __init__(self, graph: CSRGraph, color_with_interchange) -> None:
+        n = len(graph)
+        self.graph = graph
+        self.color_with_interchange = color_with_interchange
+        # color of each node, 0 means not colored yet
+        self.colors = np.zeros(n, dtype=np.int64)
+        # used[color] == step + 1 if a neighbor has color
+        self.used = np.zeros(n + 2, dtype=np.int64)
+        # buffers reused for every node, so nothing is allocated inside the loop
+        max_degree = int(graph.degree().max(initial=0))
+        self.neighbor_colors = np.empty(max_degree, dtype=np.int64)
+        self.is_free = np.empty(n + 1, dtype=bool)
+        self.max_color = 1  # additional variable to help with interchange of colors
+        # interchange looks at colors around many nodes, so they are counted as we go
+        self.counts = NeighborColorCounts(graph) if color_with_interchange else None
+
+    def color(self, node, trace=None, step=0):
+        counts = self.counts
+        if counts is not None:
+            color = counts.first_free(node, self.max_color)
+        else:
+            color = _first_fit(
+                self.graph,
+                node,
+                self.colors,
+                self.used,
+                step + 1,
+                self.max_color,
+                self.neighbor_colors,
+                self.is_free,
+            )
+        # if new color is needed
+        if self.color_with_interchange and color > self.max_color:
+            if trace is not None:
+                trace.interchange_start(step)
+            new_color = _try_interchanging_colors_array(
+                self.graph, node, self.colors, color, counts
+            )
+            if trace is not None:
+                trace.interchange_end(step, new_color != color)
+            color = new_color
+        # Assign the color to the node
+        self.colors[node] = color
+        if counts is not None:
+            counts.add(node, color)
+        self.max_color = max(color, self.max_color)
+
+    def compact(self, number_of_colors_used):
+        """
+        Returns colors as CompactColoring, in the smallest dtype that holds them.
+        """
+        return CompactColoring(self.colors.astype(color_dtype(number_of_colors_used)))
+
+
+def _first_fit(graph, node, colors, used, stamp, max_color, neighbor_colors, is_free):
+    """
+    Returns the smallest color not used by any neighbor of node, it is never
+    bigger than max_color + 1. Marks colors of neighbors with stamp in used array.
+    """
+    start, stop = graph.offsets[node], graph.offsets[node + 1]
+    neighbor_colors = neighbor_colors[: stop - start]
+    np.take(colors, graph.adjacency[start:stop], out=neighbor_colors)
+    used[neighbor_colors] = stamp
+    is_free = is_free[: max_color + 1]
+    np.not_equal(used[1 : max_color + 2], stamp, out=is_free)
+    return int(is_free.argmax()) + 1
+
+
+class NeighborColorCounts:
+    """
+    counts[color, node] is the number of neighbors of node with color, updated as
+    nodes get colors, so colors around a node are read from its column instead of
+    being gathered from all its neighbors. Rows are added when more colors are used.
+    Every color has its own row, so coloring a node updates one contiguous row.
+    """
+
+    __slots__ = ["graph", "counts"]
+
+    def __init__(self, graph: CSRGraph, number_of_colors=64) -> None:
+        self.graph = graph
+        self.counts = np.zeros((number_of_colors, len(graph)), dtype=np.int32)
+
+    def add(self, node, color):
+        if color >= len(self.counts):
+            # twice as many rows, so colors are added in amortized O(n)
+            counts = np.zeros((2 * (color + 1), len(self.graph)), dtype=np.int32)
+            counts[: len(self.counts)] = self.counts
+            self.counts = counts
+        self.counts[color, self._neighbors(node)] += 1
 
-    return node_colors, max(node_colors.values())
+    def remove(self, node, color):
+        self.counts[color, self._neighbors(node)] -= 1
 
+    def first_free(self, node, max_color):
+        """
+        Returns the smallest color not used by any neighbor of node, at most max_color + 1.
+        """
+        column = self.counts[1 : max_color + 2, node]
+        if len(column) <= max_color:  # row of max_color + 1 does not exist yet
+            column = np.append(column, 0)
+        return int((column == 0).argmax()) + 1
 
-def color_node(G: Graph, node, node_colors, max_color, color_with_interchange):
+    def _neighbors(self, node):
+        offsets = self.graph.offsets
+        return self.graph.adjacency[offsets[node] : offsets[node + 1]]
+
+
+def _try_interchanging_colors_array(graph, node, colors, proposed_color, counts):
+    """
+    Same as try_interchanging_colors, but for colors kept in array (0 means not colored)
+    and with colors around nodes read from NeighborColorCounts.
+    """
+    neighbors = counts._neighbors(node)
+    neighbor_colors = colors[neighbors]
+
+    # select nodes that have unique color in set of neighbor, ordered by first
+    # appearance of their color, which for unique colors is their own position
+    unique = (neighbor_colors > 0) & (counts.counts[neighbor_colors, node] == 1)
+    valid_neighbors = neighbors[unique]
+    if len(valid_neighbors) == 0:
+        return proposed_color
+    valid_colors = neighbor_colors[unique]
+
+    # free[c - 1, i] says if color c < proposed_color can be given to i-th valid neighbor
+    free = counts.counts[1:proposed_color, valid_neighbors] == 0
+    free[valid_colors - 1, np.arange(len(valid_neighbors))] = False
+    has_free = free.any(axis=0)
+    if not has_free.any():
+        return proposed_color
+
+    # first valid neighbor that can change color, gets the smallest free one
+    i = int(has_free.argmax())
+    valid_neighbor, color = int(valid_neighbors[i]), int(valid_colors[i])
+    new_color = int(free[:, i].argmax()) + 1
+    counts.remove(valid_neighbor, color)
+    counts.add(valid_neighbor, new_color)
+    colors[valid_neighbor] = new_color
+    return color
+
+
+def color_node(
+    G: Graph,
+    node,
+    node_colors,
+    max_color,
+    color_with_interchange,
+    trace=None,
+    step=0,
+    interchange=None,
+):
     # Find the colors of the neighbors of node
     neighbor_colors = set(node_colors.get(neighbor) for neighbor in G.neighbors(node))
     # Find the first available color that is not used by any neighbor
     for color in range(1, len(G) + 1):
         if color not in neighbor_colors:
             if color_with_interchange and color > max_color:  # if new color is needed
-                color = try_interchanging_colors(G, node, node_colors, color)
+                if trace is not None:
+                    trace.interchange_start(step)
+                if interchange is None:
+                    interchange = try_interchanging_colors
+                new_color = interchange(G, node, node_colors, color)
+                if trace is not None:
+                    trace.interchange_end(step, new_color != color)
+                color = new_color
             # Assign the color to the node
             node_colors[node] = color
             return node_colors, max(color, max_color)
 
 
-def random_sequential(G: Graph, color_with_interchange=False):
-    # obtain list of nodes in graph G and shuffle it
+def random_sequential(
+    G: Graph, color_with_interchange=False, trace=None, interchange=None, rng=None
+):
+    # obtain list of nodes in graph G and shuffle it,
+    # with rng (random.Random) given it is used instead of global random state
     order = list(G.nodes())
-    random.shuffle(order)
+    (random if rng is None else rng).shuffle(order)
 
     # use greedy on it
-    coloring, number_of_colors_used = _greedy(G, order, color_with_interchange)
+    coloring, number_of_colors_used = _greedy(
+        G, order, color_with_interchange, trace, interchange
+    )
     return coloring, number_of_colors_used
 
 
-def random_sequential_with_interchange(G: Graph):
-    return random_sequential(G, color_with_interchange=True)
+def random_sequential_with_interchange(G: Graph, trace=None, interchange=None, rng=None):
+    return random_sequential(
+        G, color_with_interchange=True, trace=trace, interchange=interchange, rng=rng
+    )
 
 
-def largest_first(G, color_with_interchange=False):
+def largest_first(G, color_with_interchange=False, trace=None, interchange=None):
     # obtain list of nodes in graph G and sort it
     order = G.nodes()
     order = sorted(order, key=lambda x: G.degree(x), reverse=True)
 
     # use greedy on it
-    coloring, number_of_colors_used = _greedy(G, order, color_with_interchange)
+    coloring, number_of_colors_used = _greedy(
+        G, order, color_with_interchange, trace, interchange
+    )
     return coloring, number_of_colors_used
 
 
-def largest_first_with_interchange(G: Graph):
-    return largest_first(G, color_with_interchange=True)
+def largest_first_with_interchange(G: Graph, trace=None, interchange=None):
+    return largest_first(G, color_with_interchange=True, trace=trace, interchange=interchange)
 
 
-def smallest_last(G: Graph, color_with_interchange=False):
-    degrees_vertices = defaultdict(set)
-    min_degree = float("inf")
+def smallest_last(G: Graph, color_with_interchange=False, trace=None, interchange=None):
+    graph = G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+    order, _ = smallest_last_ordering(graph)
 
-    # Iterate over all vertices in the graph in order to create degrees_vertices
-    # dictionary with key:value pairs degree:{nodes_that_have_this_degree}
-    for v in G:
-        min_degree = min(min_degree, G.degree(v))
-        degrees_vertices[G.degree(v)].add(v)
-
-    H = G.copy()
-    order = []
+    coloring, number_of_colors_used = _greedy(
+        graph, order[::-1], color_with_interchange, trace, interchange
+    )  # greedy on reverse order
 
-    while degrees_vertices:  # Loop until all vertices have been removed
-        while min_degree not in degrees_vertices:
-            min_degree += 1
+    if graph is not G:  # back to nodes of G
+        coloring = _coloring_of_labels(coloring, graph.labels)
+    return coloring, number_of_colors_used
 
-        # Remove a vertex from set with the current minimum degree and delate set if empty
-        min_degree_vertex = degrees_vertices[min_degree].pop()
-        if len(degrees_vertices[min_degree]) == 0:
-            degrees_vertices.pop(min_degree)
 
-        # Update the degrees of the neighbors of the removed vertex (decrease degree by 1)
-        # Transfer vertex from set 'degree' to 'degree - 1' to reflect the removal of its neighbor
-        for neighbor in H.neighbors(min_degree_vertex):
-            degree = H.degree(neighbor)
-            degrees_vertices[degree].remove(neighbor)
-            if len(degrees_vertices[degree]) == 0:
-                degrees_vertices.pop(degree)
-            degrees_vertices[degree - 1].add(neighbor)
+def _coloring_of_labels(coloring, labels):
+    """
+    Returns dict of colors keyed by original nodes (labels, None when nodes are 0..n-1)
+    from coloring of CSR graph, which may be CompactColoring of array paths.
+    """
+    if isinstance(coloring, CompactColoring):
+        return CompactColoring(coloring.colors, labels).to_dict()
+    if labels is None:
+        return coloring
+    return {labels[node]: color for node, color in coloring.items()}
 
-        H.remove_node(min_degree_vertex)  # Remove the vertex from the graph
-        order.append(min_degree_vertex)  # Add the removed vertex to the order list
-        min_degree += -1
 
-    coloring, number_of_colors_used = _greedy(
-        G, order[::-1], color_with_interchange
-    )  # greedy on reverse order
-    return coloring, number_of_colors_used
+def smallest_last_ordering(G):
+    """
+    Returns nodes of CSR graph G in order of removal of the smallest degree node
+    (smallest_last colors them in reverse) and degeneracy of G, the biggest degree
+    a node had when removed (so G can be colored with degeneracy + 1 colors).
+    Linear time bucket algorithm of Matula and Beck, G is not copied nor modified.
+    """
+    n = len(G)
+    degrees = G.degree()
+
+    # nodes sorted by degree, bucket of degree d starts at vertices[bucket_starts[d]]
+    vertices = np.argsort(degrees, kind="stable")
+    positions = np.empty(n, dtype=np.int64)  # position of each node in vertices
+    positions[vertices] = np.arange(n)
+    bucket_starts = np.zeros(int(degrees.max(initial=0)) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(degrees)[:-1], out=bucket_starts[1:])
+
+    # compact arrays of python side, indexing numpy arrays one by one is slow
+    degrees, vertices, positions, bucket_starts, offsets = (
+        array("q", a.astype(np.int64).tobytes())
+        for a in (degrees, vertices, positions, bucket_starts, G.offsets)
+    )
+    degeneracy = _remove_smallest_degree(
+        degrees, vertices, positions, bucket_starts, offsets, G.adjacency
+    )
+    return vertices.tolist(), degeneracy
+
+
+def _remove_smallest_degree(degrees, vertices, positions, bucket_starts, offsets, adjacency):
+    """
+    Main loop of smallest_last_ordering, it leaves the order in vertices and returns
+    degeneracy. Arrays are anything indexed by nodes (array.array, numpy.memmap).
+    """
+    n = len(vertices)
+    degeneracy = 0
+    for i in range(n):
+        # vertices[i] has the smallest degree among nodes not removed yet,
+        # after its removal bucket of one smaller degree starts right behind it
+        node = vertices[i]
+        degree = degrees[node]
+        degeneracy = max(degeneracy, degree)
+        bucket_starts[degree] = i + 1
+        if degree > 0:
+            bucket_starts[degree - 1] = i + 1
+
+        # Move every neighbor that is not removed yet to bucket of one smaller degree,
+        # by swapping it with the first node of its bucket and moving bucket start
+        for neighbor in adjacency[offsets[node] : offsets[node + 1]].tolist():
+            neighbor_position = positions[neighbor]
+            if neighbor_position <= i:  # neighbor was already removed
+                continue
+            neighbor_degree = degrees[neighbor]
+            first_position = bucket_starts[neighbor_degree]
+            first = vertices[first_position]
+            positions[neighbor], positions[first] = first_position, neighbor_position
+            vertices[neighbor_position], vertices[first_position] = first, neighbor
+            bucket_starts[neighbor_degree] += 1
+            degrees[neighbor] = neighbor_degree - 1
+
+    return degeneracy
+
+
+def degeneracy(G):
+    """
+    Returns degeneracy of graph G, chromatic number of G is at most degeneracy + 1.
+    """
+    graph = G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+    return smallest_last_ordering(graph)[1]
 
 
-def smallest_last_with_interchange(G: Graph):
-    return smallest_last(G, color_with_interchange=True)
+def smallest_last_with_interchange(G: Graph, trace=None, interchange=None):
+    return smallest_last(G, color_with_interchange=True, trace=trace, interchange=interchange)
 
 
-def d_satur(G: Graph, color_with_interchange=False):
+def d_satur(G: Graph, color_with_interchange=False, trace=None, interchange=None):
+    # nodes are numbered 0..n-1 in CSR graph, whatever nodes of G are
+    original = G
+    if not isinstance(G, CSRGraph):
+        G = CSRGraph.from_networkx(G)
     n = len(G)
-    satur = {i: 0 for i in range(n)}  # We will be dropping colored nodes
-    node_colors = {}  # A dictionary to keep track of the color assigned to each node
-    max_color = 1
-    for i in range(n):
-        max_satur = max(satur.values())
-        nodes = [
-            node
-            for node, saturation in satur.items()
-            if saturation == max_satur
-        ]
-        # Looking all max saturation nodes
-        degrees = {node: G.degree(node) for node in nodes}
-        # Dict with all max saturation nodes and their degrees
-        node = max(degrees, key=degrees.get)
-        # Get node with max degree and color it
-        node_colors, max_color = color_node(
-            G, node, node_colors, max_color, color_with_interchange
-        )
-        # Remove colored node from satur dict
-        del satur[node]
-        # Update saturation of uncolored neighbors of node
-        for neighbor in G.neighbors(node):
-            if neighbor in satur:
-                satur[neighbor] += 1
 
-    coloring, number_of_colors_used = node_colors, max_color
+    # uncolored nodes ordered by (max saturation, max degree, min node), on dense
+    # graphs saturation changes so often that scanning all nodes with numpy is faster
+    # ties of degree broken by smaller node of G, nodes that are not integers by their
+    # place in G (CSR graph numbers nodes in order of insertion, not by value)
+    ties = np.arange(n)
+    if G.labels is not None and all(isinstance(label, int) for label in G.labels):
+        ties = np.array(G.labels)
+    order = np.lexsort((ties, -G.degree())).tolist()
+    dense = 2 * G.number_of_edges() >= DENSE_AVERAGE_DEGREE * n
+    queue = _SaturationArray(G, order) if dense else _SaturationBuckets(G, order)
+
+    # dense graphs are colored like in _greedy, with colors in array (as long as
+    # interchange is the default one)
+    if dense and interchange is None:
+        array_coloring = _ArrayColoring(G, color_with_interchange)
+        for step in range(n):
+            if trace is not None:
+                trace.node(step)
+            node = queue.pop()
+            array_coloring.color(node, trace, step)
+            queue.colored(node)
+        number_of_colors_used = array_coloring.max_color
+        if G is original:  # colors of nodes 0..n-1 are handed back as they are
+            return array_coloring.compact(number_of_colors_used), number_of_colors_used
+        coloring = dict(enumerate(array_coloring.colors.tolist()))
+    else:
+        node_colors = {}  # A dictionary to keep track of the color assigned to each node
+        max_color = 1
+        for step in range(n):
+            if trace is not None:
+                trace.node(step)
+            # Get node with max saturation (ties broken by max degree) and color it
+            node = queue.pop()
+            node_colors, max_color = color_node(
+                G,
+                node,
+                node_colors,
+                max_color,
+                color_with_interchange,
+                trace,
+                step,
+                interchange,
+            )
+            # Update saturation of uncolored neighbors of node
+            queue.colored(node)
+        coloring, number_of_colors_used = node_colors, max_color
+
+    if G is not original and G.labels is not None:  # back to nodes of G
+        coloring = {G.labels[node]: color for node, color in coloring.items()}
     return coloring, number_of_colors_used
 
 
-def d_satur_with_interchange(G: Graph):
-    return d_satur(G, color_with_interchange=True)
+class _SaturationBuckets:
+    """
+    Bucket queue of uncolored nodes of CSR graph for d_satur, bucket of saturation s
+    (number of colored neighbors) is a heap of ranks of its nodes (node order[rank]),
+    so the popped node has max saturation and then the smallest rank.
+    Saturation only grows by 1, nodes moved to the next bucket leave stale entries,
+    which are dropped when they outnumber nodes of the bucket, so memory stays O(n).
+    """
+
+    __slots__ = ["graph", "order", "ranks", "saturation", "buckets", "sizes", "top"]
+
+    def __init__(self, graph: CSRGraph, order) -> None:
+        n = len(graph)
+        self.graph = graph
+        self.order = order
+        self.ranks = [0] * n
+        for rank, node in enumerate(order):
+            self.ranks[node] = rank
+        self.saturation = [0] * n  # -1 for colored nodes
+        self.buckets = [list(range(n))]  # sorted list is a heap
+        self.sizes = [n]  # number of nodes of every bucket
+        self.top = 0
+
+    def pop(self):
+        while self.sizes[self.top] == 0:
+            self.top -= 1
+        bucket = self.buckets[self.top]
+        while True:
+            node = self.order[heappop(bucket)]
+            if self.saturation[node] == self.top:  # else entry is stale
+                break
+        self.sizes[self.top] -= 1
+        self.saturation[node] = -1
+        return node
+
+    def colored(self, node):
+        saturation, buckets, sizes = self.saturation, self.buckets, self.sizes
+        for neighbor in self.graph.neighbors(node):
+            old = saturation[neighbor]
+            if old < 0:
+                continue
+            new = old + 1
+            saturation[neighbor] = new
+            if new == len(buckets):
+                buckets.append([])
+                sizes.append(0)
+            heappush(buckets[new], self.ranks[neighbor])
+            sizes[new] += 1
+            self.top = max(self.top, new)
+            sizes[old] -= 1
+            if len(buckets[old]) > 2 * sizes[old] + 16:
+                bucket = [r for r in buckets[old] if saturation[self.order[r]] == old]
+                heapify(bucket)
+                buckets[old] = bucket
+
+
+class _SaturationArray:
+    """
+    The same queue as _SaturationBuckets for dense graphs: keys[node] is
+    saturation * n + n - 1 - rank, so the next node is found by one argmax over all
+    nodes and coloring a node adds n to keys of its whole row at once.
+    """
+
+    __slots__ = ["graph", "keys"]
+
+    # key of colored nodes, it stays negative after n * n additions
+    COLORED = np.iinfo(np.int64).min // 2
+
+    def __init__(self, graph: CSRGraph, order) -> None:
+        n = len(graph)
+        self.graph = graph
+        self.keys = np.empty(n, dtype=np.int64)
+        self.keys[order] = np.arange(n - 1, -1, -1)
+
+    def pop(self):
+        node = int(self.keys.argmax())
+        self.keys[node] = self.COLORED
+        return node
+
+    def colored(self, node):
+        offsets = self.graph.offsets
+        self.keys[self.graph.adjacency[offsets[node] : offsets[node + 1]]] += len(self.keys)
+
+
+def d_satur_with_interchange(G: Graph, trace=None, interchange=None):
+    return d_satur(G, color_with_interchange=True, trace=trace, interchange=interchange)
 
 
 def try_interchanging_colors(G: Graph, node, node_colors, proposed_color):
@@ -187,3 +590,100 @@ def try_interchanging_colors(G: Graph, node, node_colors, proposed_color):
             break
 
     return best_color
+
+
+class KempeInterchange:
+    """
+    Interchange that frees a color for node by swapping two colors a and b on a whole
+    Kempe chain (connected part of nodes colored a or b) that contains all neighbors of
+    node colored a and none colored b, afterwards node can be colored a.
+    The cheap recolor of a single neighbor of try_interchanging_colors is tried first,
+    chains are searched only when it fails, and only for colors b used around
+    neighbors colored a (for other colors the chain is just these neighbors).
+    Chains bigger than max_chain_size are given up, as is the whole attempt after
+    time_budget seconds (None means no limit). Use it as interchange argument, e.g.
+    largest_first_with_interchange(G, interchange=KempeInterchange(100, 0.001))
+    """
+
+    __slots__ = ["max_chain_size", "time_budget"]
+
+    def __init__(self, max_chain_size=1000, time_budget=0.003) -> None:
+        self.max_chain_size = max_chain_size
+        self.time_budget = time_budget
+
+    def __call__(self, G: Graph, node, node_colors, proposed_color):
+        color = try_interchanging_colors(G, node, node_colors, proposed_color)
+        if color != proposed_color:
+            return color
+
+        deadline = None
+        if self.time_budget is not None:
+            deadline = perf_counter() + self.time_budget
+
+        colors_neighbors = defaultdict(list)
+        for neighbor in G.neighbors(node):
+            if neighbor in node_colors:
+                colors_neighbors[node_colors[neighbor]].append(neighbor)
+
+        # colors used by the fewest neighbors are the easiest to free
+        for color in sorted(colors_neighbors, key=lambda c: len(colors_neighbors[c])):
+            other_colors = set()
+            for neighbor in colors_neighbors[color]:
+                for neighbor_of_neighbor in G.neighbors(neighbor):
+                    other_colors.add(node_colors.get(neighbor_of_neighbor))
+            for other_color in range(1, proposed_color):
+                if other_color == color:
+                    continue
+                if other_color not in other_colors:  # no need to search
+                    chain = colors_neighbors[color]
+                else:
+                    chain = self._chain(
+                        G,
+                        node_colors,
+                        colors_neighbors[color],
+                        color,
+                        other_color,
+                        set(colors_neighbors[other_color]),
+                        deadline,
+                    )
+                if chain is _TIMEOUT:
+                    return proposed_color
+                if chain is None:
+                    continue
+
+                for chain_node in chain:  # swap colors on the chain
+                    if node_colors[chain_node] == color:
+                        node_colors[chain_node] = other_color
+                    else:
+                        node_colors[chain_node] = color
+                return color
+
+        return proposed_color
+
+    def _chain(self, G, node_colors, start, color, other_color, blocked, deadline):
+        """
+        Returns nodes of the Kempe chain of colors color and other_color containing
+        start nodes, None if it reaches any of blocked nodes or is too big.
+        """
+        chain = set(start)
+        queue = list(start)
+        while queue:
+            if deadline is not None and perf_counter() > deadline:
+                return _TIMEOUT
+            chain_node = queue.pop()
+            for neighbor in G.neighbors(chain_node):
+                if neighbor in chain:
+                    continue
+                neighbor_color = node_colors.get(neighbor)
+                if neighbor_color != color and neighbor_color != other_color:
+                    continue
+                if neighbor in blocked:
+                    return None
+                chain.add(neighbor)
+                queue.append(neighbor)
+                if len(chain) > self.max_chain_size:
+                    return None
+        return chain
+
+
+_TIMEOUT = object()  # returned by KempeInterchange._chain when time budget is used up
@@ -0,0 +1,147 @@
+import hashlib
+import inspect
+import os
+import pickle
+import random
+from collections import OrderedDict
+import numpy as np
+from eviction import evict_least_recently_used
+from graph import Graph
+from relabeling import CompactColoring, compact_coloring, relabel
+
+
+def fingerprint(G):
+    """
+    Returns hex digest of structure of graph G (networkx or graph.Graph). Order of
+    neighbors is part of it, because it changes results of greedy algorithms too.
+    Arrays are hashed as they are, without copies, so the same graph stored with
+    other dtype of arrays has other fingerprint.
+    """
+    graph = G if isinstance(G, Graph) else Graph.from_networkx(G)
+    digest = hashlib.blake2b(digest_size=16)
+    for array in (graph.offsets, graph.adjacency):
+        digest.update(array.dtype.str.encode())
+        digest.update(np.ascontiguousarray(array))
+    if graph.labels is not None:
+        digest.update(pickle.dumps(graph.labels))
+    return digest.hexdigest()
+
+
+class ColoringCache:
+    """
+    Cache of results of coloring functions keyed by graph fingerprint, function name,
+    interchange flag and seed. Randomized functions (ones with rng argument) called
+    without seed are not cached, so every call gives a new coloring, as without cache.
+    Colorings of nodes 0..n-1 are stored as relabeling.CompactColoring, a few bytes
+    per node, labels of G are attached when they are returned.
+    Recent results are kept in memory (at most max_entries),
+    with directory given results are also pickled there and the least recently used
+    files are removed when they take more than max_disk_bytes.
+    """
+
+    def __init__(self, max_entries=128, directory=None, max_disk_bytes=1 << 30) -> None:
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = OrderedDict()  # key: (coloring, number_of_colors_used)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypasses = 0  # calls of randomized functions without seed
+        self.memory_evictions = 0
+        self.disk_evictions = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def color(self, coloring_func, G, color_with_interchange=False, seed=None):
+        """
+        Returns coloring and number of used colors like coloring_func(G) would, with
+        coloring as relabeling.CompactColoring (read only Mapping keyed by nodes of G),
+        random is seeded with seed before computing result (when seed is not None).
+        """
+        parameters = inspect.signature(coloring_func).parameters
+        if color_with_interchange and "color_with_interchange" not in parameters:
+            raise ValueError(
+                f"{coloring_func.__name__} does not take color_with_interchange, "
+                "use it without color_with_interchange=True"
+            )
+
+        # G is converted once, for both fingerprint and coloring function
+        graph, labels = relabel(G)
+        if seed is None and "rng" in parameters:
+            self.bypasses += 1
+            result = self._compute(coloring_func, graph, color_with_interchange)
+        else:
+            key = (fingerprint(graph), coloring_func.__name__, color_with_interchange, seed)
+            result = self._get(key)
+            if result is None:
+                self.misses += 1
+                if seed is not None:
+                    random.seed(seed)
+                result = self._compute(coloring_func, graph, color_with_interchange)
+                self._put(key, result)
+
+        # colors of nodes 0..n-1 are stored, labels of G are attached to every result
+        coloring, number_of_colors_used = result
+        return CompactColoring(coloring.colors, labels), number_of_colors_used
+
+    def _compute(self, coloring_func, graph, color_with_interchange):
+        if color_with_interchange:
+            return compact_coloring(coloring_func, graph, color_with_interchange=True)
+        return compact_coloring(coloring_func, graph)
+
+    def stats(self):
+        requests = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "memory_evictions": self.memory_evictions,
+            "disk_evictions": self.disk_evictions,
+            "hit_rate": (self.hits + self.disk_hits) / requests if requests else 0.0,
+            "memory_entries": len(self.memory),
+        }
+
+    def _get(self, key):
+        if key in self.memory:
+            self.hits += 1
+            self.memory.move_to_end(key)
+            return self.memory[key]
+
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as file:
+                    result = pickle.load(file)
+            except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+                return None
+            os.utime(path)  # file modification time is used as last access time
+            self.disk_hits += 1
+            self._put_in_memory(key, result)
+            return result
+
+        return None
+
+    def _put(self, key, result):
+        self._put_in_memory(key, result)
+        if self.directory is not None:
+            # written to temporary file first, so other processes never read half of it
+            path = self._path(key)
+            with open(path + ".tmp", "wb") as file:
+                pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path + ".tmp", path)
+            self.disk_evictions += evict_least_recently_used(
+                self.directory, ".pkl", self.max_disk_bytes
+            )
+
+    def _put_in_memory(self, key, result):
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+            self.memory_evictions += 1
+
+    def _path(self, key):
+        name = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.directory, name + ".pkl")
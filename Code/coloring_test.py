@@ -3,6 +3,9 @@ from coloring_algorithms import random_sequential, random_sequential_with_interc
 from coloring_algorithms import largest_first, largest_first_with_interchange
 from coloring_algorithms import smallest_last, smallest_last_with_interchange
 from coloring_algorithms import d_satur, d_satur_with_interchange
+from jones_plassmann import jones_plassmann, jones_plassmann_largest_first
+from graph_factory import generate
+from graph import Graph
 
 
 function_list = [
@@ -14,15 +17,28 @@ function_list = [
     smallest_last_with_interchange,
     d_satur,
     d_satur_with_interchange,
+    jones_plassmann,
+    jones_plassmann_largest_first,
 ]
 
 probabilities = [0.1, 0.3, 0.5, 0.7, 0.9]
 
 for p in probabilities:
-    G = nx.gnp_random_graph(1000, p, seed=2137)
-    for function in function_list:
-        coloring, number_of_colors_used = function(G)
-        for edge in G.edges():
-            assert (
-                coloring[edge[0]] != coloring[edge[1]]
-            ), f"{function.__name__} created invalid coloring, two adjacent nodes have the same color"
+    csr_graph = generate("gnp", 1000, p=p, seed=2137)
+    for graph in [csr_graph.to_networkx(), csr_graph]:
+        for function in function_list:
+            coloring, number_of_colors_used = function(graph)
+            for edge in graph.edges():
+                assert (
+                    coloring[edge[0]] != coloring[edge[1]]
+                ), f"{function.__name__} created invalid coloring, two adjacent nodes have the same color"
+
+# float adjacency matrix (what nx.to_numpy_array returns), any nonzero entry is an edge
+G = nx.gnp_random_graph(200, 0.1, seed=2137)
+graph = Graph(nx.to_numpy_array(G))
+assert sorted(map(sorted, graph.edges())) == sorted(map(sorted, G.edges()))
+coloring, number_of_colors_used = d_satur(graph)
+for edge in G.edges():
+    assert (
+        coloring[edge[0]] != coloring[edge[1]]
+    ), "d_satur created invalid coloring of graph from float matrix"
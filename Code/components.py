@@ -0,0 +1,130 @@
+from multiprocessing import Pool
+from time import perf_counter
+import networkx as nx
+import numpy as np
+from graph import Graph
+from coloring_algorithms import d_satur, largest_first
+from relabeling import labeled_coloring, relabel
+
+# components with fewer nodes are colored with largest_first in the main process
+SMALL_COMPONENT = 64
+
+
+def component_coloring(
+    G,
+    coloring_func=d_satur,
+    processes=None,
+    small_component=SMALL_COMPONENT,
+    trace=None,
+):
+    """
+    Colors every connected component of G (networkx or graph.Graph) on its own and
+    returns one coloring of G and number of its colors (the biggest over components).
+    Bipartite components are colored with 2 colors while they are searched,
+    other components with fewer than small_component nodes with largest_first and
+    the rest with coloring_func on a pool of processes (processes=1 colors them in
+    the main process).
+    trace gets node event for every component, when it is colored (large ones after
+    the others), its step is the number of nodes of components colored before.
+    """
+    graph, labels = relabel(G)
+    n = len(graph)
+    colors = np.zeros(n, dtype=np.int64)
+    colored = 0
+    large = []
+    for nodes, bipartite_colors in connected_components(graph):
+        if bipartite_colors is not None:
+            colors[nodes] = bipartite_colors
+        elif len(nodes) < small_component:
+            colors[nodes] = _color_component(largest_first, subgraph(graph, nodes))
+        else:
+            large.append(nodes)
+            continue
+        if trace is not None:
+            trace.node(colored)
+        colored += len(nodes)
+
+    tasks = ((coloring_func, subgraph(graph, nodes)) for nodes in large)
+    if processes == 1 or len(large) <= 1:
+        results = map(_color_task, tasks)
+        for nodes, component_colors in zip(large, results):
+            colors[nodes] = component_colors
+            if trace is not None:
+                trace.node(colored)
+            colored += len(nodes)
+    else:
+        with Pool(processes) as pool:
+            for nodes, component_colors in zip(large, pool.imap(_color_task, tasks)):
+                colors[nodes] = component_colors
+                if trace is not None:
+                    trace.node(colored)
+                colored += len(nodes)
+
+    return labeled_coloring(colors, labels), int(colors.max(initial=0))
+
+
+def connected_components(G):
+    """
+    Yields connected components of CSR graph G as sorted arrays of nodes, each with
+    array of colors 1, 2 of its nodes if the component is bipartite (else None).
+    Components are searched breadth first, in O(n + m) time.
+    """
+    n = len(G)
+    side = [0] * n  # 0 for not visited yet, else 1 or 2 alternating along every path
+    for start in range(n):
+        if side[start]:
+            continue
+        side[start] = 1
+        component = [start]
+        bipartite = True
+        for node in component:  # component grows while it is iterated
+            other_side = 3 - side[node]
+            for neighbor in G.neighbors(node):
+                if not side[neighbor]:
+                    side[neighbor] = other_side
+                    component.append(neighbor)
+                elif side[neighbor] != other_side:
+                    bipartite = False
+        component.sort()
+        nodes = np.array(component, dtype=np.int64)
+        yield nodes, np.array([side[node] for node in component]) if bipartite else None
+
+
+def subgraph(G, nodes):
+    """
+    Returns CSR graph induced by sorted array of nodes that make whole connected
+    components of G, node i of subgraph is nodes[i], order of neighbors is kept.
+    """
+    local = np.full(len(G), -1, dtype=np.int64)
+    local[nodes] = np.arange(len(nodes))
+    starts = G.offsets[nodes]
+    degrees = G.offsets[nodes + 1] - starts
+    offsets = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(degrees, out=offsets[1:])
+    # position of every neighbor of every node in adjacency of G
+    positions = np.repeat(starts - offsets[:-1], degrees) + np.arange(offsets[-1])
+    return Graph.from_csr(offsets, local[G.adjacency[positions]].astype(G.adjacency.dtype))
+
+
+def _color_component(coloring_func, graph):
+    coloring, _ = coloring_func(graph)
+    return [coloring[node] for node in range(len(graph))]
+
+
+def _color_task(task):
+    return _color_component(*task)
+
+
+if __name__ == "__main__":
+    # many dense components, as in graph of many independent small problems
+    G = nx.disjoint_union_all(
+        [nx.gnp_random_graph(300, 0.3, seed=seed) for seed in range(40)]
+        + [nx.random_labeled_tree(50, seed=seed) for seed in range(1000)]
+    )
+    for name, function in [
+        ("d_satur", lambda G: d_satur(G)),
+        ("component_coloring", lambda G: component_coloring(G, processes=1)),
+    ]:
+        start = perf_counter()
+        coloring, number_of_colors_used = function(G)
+        print(f"{name}: {number_of_colors_used} colors, {perf_counter() - start:.2f}s")
@@ -0,0 +1,106 @@
+from collections import Counter
+from networkx import Graph
+from coloring_algorithms import color_node, largest_first
+
+
+class DynamicColoring:
+    """
+    Keeps a proper coloring of networkx graph G while edges and nodes are added and removed.
+    Only nodes touched by a change are recolored (with color_node, so with interchange
+    if enabled), every update costs time proportional to their neighborhoods.
+    G is modified in place.
+    """
+
+    def __init__(self, G: Graph, coloring=None, color_with_interchange=False) -> None:
+        self.G = G
+        self.color_with_interchange = color_with_interchange
+        if coloring is None:
+            coloring, _ = largest_first(G, color_with_interchange)
+        self.node_colors = dict(coloring)
+        self.color_counts = Counter(self.node_colors.values())  # color: number of nodes
+        self.max_color = max(self.color_counts, default=0)
+
+    def number_of_colors(self):
+        return self.max_color
+
+    def add_node(self, node, neighbors=()):
+        neighbors = list(neighbors)
+        if node in neighbors:
+            raise ValueError(f"self loop at node {node} can not be colored")
+        # neighbors not in G yet are added (and colored) first, as isolated nodes
+        for neighbor in neighbors:
+            if neighbor not in self.G:
+                self.add_node(neighbor)
+        self.G.add_node(node)
+        self.G.add_edges_from((node, neighbor) for neighbor in neighbors)
+        self._recolor(node)
+
+    def remove_node(self, node):
+        neighbors = list(self.G.neighbors(node))
+        self.G.remove_node(node)
+        self._set_color(node, None)
+        # neighbors lost a constraint, maybe some of them can use smaller color now
+        for neighbor in neighbors:
+            self._lower_color(neighbor)
+        self._shrink_max_color()
+
+    def add_edge(self, u, v):
+        if u == v:
+            raise ValueError(f"self loop at node {u} can not be colored")
+        for node in (u, v):
+            if node not in self.G:
+                self.add_node(node)
+        self.G.add_edge(u, v)
+        if self.node_colors[u] == self.node_colors[v]:
+            # recolor endpoint with fewer neighbors, it is more likely to find free color
+            node = u if self.G.degree(u) <= self.G.degree(v) else v
+            self._recolor(node)
+
+    def remove_edge(self, u, v):
+        self.G.remove_edge(u, v)
+        self._lower_color(u)
+        self._lower_color(v)
+        self._shrink_max_color()
+
+    def _recolor(self, node):
+        """
+        Colors node from scratch with color_node, interchange may change color of
+        one of its neighbors, so their colors are compared before and after.
+        """
+        self._set_color(node, None)
+        neighbor_colors = {n: self.node_colors.get(n) for n in self.G.neighbors(node)}
+        self.node_colors, self.max_color = color_node(
+            self.G,
+            node,
+            self.node_colors,
+            self.max_color,
+            self.color_with_interchange,
+        )
+        self.color_counts[self.node_colors[node]] += 1
+        for neighbor, color in neighbor_colors.items():
+            if self.node_colors.get(neighbor) != color:  # changed by interchange
+                self.color_counts[color] -= 1
+                self.color_counts[self.node_colors[neighbor]] += 1
+        self._shrink_max_color()
+
+    def _lower_color(self, node):
+        # move node to the smallest color not used by its neighbors, if it is smaller
+        neighbor_colors = set(self.node_colors.get(n) for n in self.G.neighbors(node))
+        for color in range(1, self.node_colors[node]):
+            if color not in neighbor_colors:
+                self._set_color(node, color)
+                return
+
+    def _set_color(self, node, color):
+        old_color = self.node_colors.pop(node, None)
+        if old_color is not None:
+            self.color_counts[old_color] -= 1
+        if color is not None:
+            self.node_colors[node] = color
+            self.color_counts[color] += 1
+
+    def _shrink_max_color(self):
+        # colors above max_color are never used, so only empty top colors are dropped
+        while self.max_color > 0 and self.color_counts[self.max_color] == 0:
+            self.color_counts.pop(self.max_color, None)
+            self.max_color -= 1
@@ -0,0 +1,29 @@
+import os
+
+
+def evict_least_recently_used(directory, suffix, max_bytes):
+    """
+    Removes files of directory whose names end with suffix, least recently modified
+    first, until they take at most max_bytes. Files removed meanwhile by other
+    processes are skipped. Returns the number of removed files.
+    """
+    files = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(suffix):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # removed by another process
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+    total_size = sum(size for _, size, _ in files)
+    evictions = 0
+    for _, size, path in sorted(files):
+        if total_size <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            evictions += 1
+        except FileNotFoundError:  # removed by another process
+            pass
+        total_size -= size
+    return evictions
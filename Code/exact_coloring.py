@@ -0,0 +1,293 @@
+import os
+from multiprocessing import Pool, Value
+from time import time
+import networkx as nx
+from graph import Graph
+from coloring_algorithms import largest_first, largest_first_with_interchange
+from coloring_algorithms import smallest_last, smallest_last_with_interchange
+from coloring_algorithms import d_satur, d_satur_with_interchange
+from coloring_algorithms import smallest_last_ordering
+from lower_bounds import greedy_clique, lower_bounds
+from relabeling import labeled_coloring, relabel
+
+# heuristics whose best result is the starting upper bound
+HEURISTICS = [
+    largest_first,
+    largest_first_with_interchange,
+    smallest_last,
+    smallest_last_with_interchange,
+    d_satur,
+    d_satur_with_interchange,
+]
+
+# how often (in search steps) deadline and bound found by other processes are checked
+CHECK_EVERY = 1024
+
+# state of worker process, set by _init_worker
+_worker = {}
+
+
+def exact_coloring(G, time_limit=60.0, processes=None, trace=None):
+    """
+    DSatur branch and bound for chromatic number of G (networkx or graph.Graph).
+    Returns the best coloring found, number of its colors and lower bound on chromatic
+    number, when both numbers are equal coloring is optimal. Search starts from the
+    best coloring of HEURISTICS, bound from lower_bounds module and a clique colored
+    with its own colors, subtrees are searched by a pool of processes that share
+    the best bound found so far.
+    After time_limit seconds (None means no limit) best results found so far are returned.
+    trace gets node event after every searched subtree, its step is the number of
+    subtrees searched before.
+    """
+    deadline = None if time_limit is None else time() + time_limit
+    graph, labels = relabel(G)
+    n = len(graph)
+    if n == 0:
+        return {}, 0, 0
+    neighbors = [graph.neighbors(node) for node in range(n)]
+
+    best_colors, upper_bound = _best_heuristic(graph)
+    # ordering and clique are shared with the bound, which is at least size of clique
+    order, degeneracy = smallest_last_ordering(graph)
+    clique = greedy_clique(graph, order, degeneracy)
+    lower_bound = max(lower_bounds(graph, order, degeneracy, clique).values())
+
+    if upper_bound > lower_bound:
+        shared_bound = Value("i", upper_bound)
+        arguments = (neighbors, shared_bound, lower_bound, deadline)
+        search = _BranchAndBound(neighbors, upper_bound, lower_bound, deadline)
+        prefix = [(node, color) for color, node in enumerate(clique, 1)]
+        subproblems = search.split(prefix, 8 * (processes or os.cpu_count() or 1))
+        if search.best is not None:  # coloring found while splitting
+            best_colors, upper_bound = search.best, search.upper_bound
+            shared_bound.value = upper_bound
+
+        if processes == 1:
+            _init_worker(*arguments)
+            results = map(_solve_subproblem, subproblems)
+            result = _collect(results, best_colors, upper_bound, trace)
+        else:
+            with Pool(processes, initializer=_init_worker, initargs=arguments) as pool:
+                results = pool.imap_unordered(_solve_subproblem, subproblems)
+                result = _collect(results, best_colors, upper_bound, trace)
+        best_colors, upper_bound, timed_out = result
+
+        # every subtree was searched for coloring better than the best one
+        if not timed_out:
+            lower_bound = upper_bound
+
+    return labeled_coloring(best_colors, labels), upper_bound, lower_bound
+
+
+def _best_heuristic(graph):
+    best_colors, upper_bound = None, len(graph) + 1
+    for function in HEURISTICS:
+        coloring, number_of_colors_used = function(graph)
+        if number_of_colors_used < upper_bound:
+            best_colors = [coloring[node] for node in range(len(graph))]
+            upper_bound = number_of_colors_used
+    return best_colors, upper_bound
+
+
+def _collect(results, best_colors, upper_bound, trace):
+    timed_out = False
+    for step, result in enumerate(results):
+        colors, number_of_colors_used, subproblem_timed_out = result
+        if trace is not None:
+            trace.node(step)
+        timed_out = timed_out or subproblem_timed_out
+        if colors is not None and number_of_colors_used < upper_bound:
+            best_colors, upper_bound = colors, number_of_colors_used
+    return best_colors, upper_bound, timed_out
+
+
+def _init_worker(neighbors, shared_bound, lower_bound, deadline):
+    _worker.update(
+        neighbors=neighbors,
+        shared_bound=shared_bound,
+        lower_bound=lower_bound,
+        deadline=deadline,
+    )
+
+
+def _solve_subproblem(prefix):
+    shared_bound = _worker["shared_bound"]
+    search = _BranchAndBound(
+        _worker["neighbors"],
+        shared_bound.value,
+        _worker["lower_bound"],
+        _worker["deadline"],
+        shared_bound,
+    )
+    search.run(prefix)
+    return search.best, search.upper_bound, search.timed_out
+
+
+class _BranchAndBound:
+    """
+    Depth first DSatur search for coloring with fewer than upper_bound colors,
+    uncolored node with most colors around it (ties broken by most uncolored neighbors)
+    gets every color it can have, the first color not used yet included.
+    counts[node][color] is the number of neighbors of node with color.
+    """
+
+    __slots__ = [
+        "neighbors",
+        "colors",
+        "counts",
+        "saturation",
+        "degrees",
+        "uncolored",
+        "upper_bound",
+        "lower_bound",
+        "deadline",
+        "shared_bound",
+        "best",
+        "steps",
+        "timed_out",
+    ]
+
+    def __init__(self, neighbors, upper_bound, lower_bound, deadline, shared_bound=None):
+        n = len(neighbors)
+        self.neighbors = neighbors
+        self.colors = [0] * n  # 0 means not colored yet
+        self.counts = [[0] * (upper_bound + 1) for _ in range(n)]
+        self.saturation = [0] * n  # number of different colors around node
+        self.degrees = [len(node_neighbors) for node_neighbors in neighbors]
+        self.uncolored = set(range(n))
+        self.upper_bound = upper_bound
+        self.lower_bound = lower_bound
+        self.deadline = deadline
+        self.shared_bound = shared_bound
+        self.best = None  # colors of the best coloring found by this search
+        self.steps = 0
+        self.timed_out = False
+
+    def assign(self, node, color):
+        self.colors[node] = color
+        self.uncolored.discard(node)
+        for neighbor in self.neighbors[node]:
+            counts = self.counts[neighbor]
+            if counts[color] == 0:
+                self.saturation[neighbor] += 1
+            counts[color] += 1
+            self.degrees[neighbor] -= 1
+
+    def unassign(self, node):
+        color = self.colors[node]
+        self.colors[node] = 0
+        self.uncolored.add(node)
+        for neighbor in self.neighbors[node]:
+            counts = self.counts[neighbor]
+            counts[color] -= 1
+            if counts[color] == 0:
+                self.saturation[neighbor] -= 1
+            self.degrees[neighbor] += 1
+
+    def select(self):
+        saturation, degrees = self.saturation, self.degrees
+        return max(self.uncolored, key=lambda node: (saturation[node], degrees[node]))
+
+    def next_color(self, node, color, number_of_colors):
+        """
+        Returns the smallest color bigger than color that node can have, None if there
+        is no such color that gives fewer than upper_bound colors.
+        """
+        counts = self.counts[node]
+        for color in range(color + 1, min(number_of_colors + 1, self.upper_bound - 1) + 1):
+            if counts[color] == 0:
+                return color
+        return None
+
+    def record(self, number_of_colors):
+        self.best = self.colors[:]
+        self.upper_bound = number_of_colors
+        if self.shared_bound is not None:
+            with self.shared_bound.get_lock():
+                if number_of_colors < self.shared_bound.value:
+                    self.shared_bound.value = number_of_colors
+
+    def split(self, prefix, number_of_subproblems):
+        """
+        Returns list of prefixes (lists of node, color pairs) of subtrees below prefix,
+        whole levels of the search tree are expanded until there are enough of them.
+        """
+        subproblems = [prefix]
+        while 0 < len(subproblems) < number_of_subproblems:
+            children = []
+            for subproblem in subproblems:
+                for node, color in subproblem:
+                    self.assign(node, color)
+                number_of_colors = max(color for _, color in subproblem)
+                if not self.uncolored:
+                    self.record(number_of_colors)
+                else:
+                    node = self.select()
+                    color = self.next_color(node, 0, number_of_colors)
+                    while color is not None:
+                        children.append(subproblem + [(node, color)])
+                        color = self.next_color(node, color, number_of_colors)
+                for node, _ in reversed(subproblem):
+                    self.unassign(node)
+            subproblems = children
+        # subtrees that can not improve on coloring found while splitting are dropped
+        return [s for s in subproblems if max(c for _, c in s) < self.upper_bound]
+
+    def run(self, prefix):
+        """
+        Searches subtree below prefix, stops when upper_bound reaches lower_bound
+        or after deadline.
+        """
+        # bound found by other subtrees after splitting can make the whole subtree
+        # useless (counts have no room for colors of prefix then)
+        if max(color for _, color in prefix) >= self.upper_bound:
+            return
+        for node, color in prefix:
+            self.assign(node, color)
+        number_of_colors = max(color for _, color in prefix)
+
+        stack = []  # (node, color, number_of_colors before node was colored)
+        node, color = None, 0
+        if self.uncolored:
+            node = self.select()
+        else:
+            self.record(number_of_colors)
+
+        while node is not None and self.upper_bound > self.lower_bound:
+            self.steps += 1
+            if self.steps % CHECK_EVERY == 0:
+                if self.deadline is not None and time() > self.deadline:
+                    self.timed_out = True
+                    return
+                if self.shared_bound is not None:
+                    self.upper_bound = min(self.upper_bound, self.shared_bound.value)
+
+            color = self.next_color(node, color, number_of_colors)
+            if color is not None:
+                self.assign(node, color)
+                stack.append((node, color, number_of_colors))
+                number_of_colors = max(number_of_colors, color)
+                if self.uncolored:
+                    node, color = self.select(), 0
+                    continue
+                self.record(number_of_colors)
+            # all colors of node were tried (or coloring was completed), go back
+            if not stack:
+                return
+            node, color, number_of_colors = stack.pop()
+            self.unassign(node)
+
+
+if __name__ == "__main__":
+    # comparison of heuristics with chromatic number and clique number (TODO 8)
+    for p in [0.1, 0.3, 0.5, 0.7, 0.9]:
+        G = nx.gnp_random_graph(70, p, seed=2137)
+        graph = Graph.from_networkx(G)
+        start = time()
+        coloring, number_of_colors_used, lower_bound = exact_coloring(G, time_limit=60)
+        heuristic = {f.__name__: f(graph)[1] for f in HEURISTICS}
+        print(
+            f"p={p}: clique {len(greedy_clique(graph))}, chromatic number in "
+            f"[{lower_bound}, {number_of_colors_used}] ({time() - start:.1f}s), "
+            f"heuristics {heuristic}"
+        )
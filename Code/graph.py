@@ -1,24 +1,219 @@
+from itertools import chain
+import os
+import pickle
+import networkx as nx
+import numpy as np
+
+
 class Graph:
-    __slots__ = ["size", "data"]
+    """
+    Undirected graph stored in compressed sparse row (CSR) form.
+    Nodes are integers 0..size-1, neighbors of node v are
+    adjacency[offsets[v]:offsets[v + 1]].
+    """
+
+    __slots__ = ["size", "offsets", "adjacency", "labels"]
 
     def __init__(self, data, stored_in_matrix=True) -> None:
-        self.size = len(data)
-        self.data = data
+        # data is either an adjacency matrix or a list of neighbor lists
+        if stored_in_matrix:
+            graph = Graph.from_adjacency_matrix(data)
+        else:
+            graph = Graph.from_adjacency_list(data)
+        self.size = graph.size
+        self.offsets = graph.offsets
+        self.adjacency = graph.adjacency
+        self.labels = graph.labels
+
+    @classmethod
+    def from_csr(cls, offsets, adjacency, labels=None):
+        """
+        Creates graph directly from offsets and adjacency arrays (no copy is made).
+        labels is an optional list of original names of nodes 0..size-1
+        """
+        graph = cls.__new__(cls)
+        graph.size = len(offsets) - 1
+        graph.offsets = offsets
+        graph.adjacency = adjacency
+        graph.labels = labels
+        return graph
+
+    @classmethod
+    def from_networkx(cls, G):
+        """
+        Creates graph from networkx graph, node i of the new graph is the i-th node of G.
+        Order of neighbors is the same as in G, so algorithms visit them in the same order.
+        """
+        labels = list(G)
+        n = len(labels)
+        # neighbor dicts of networkx in order of nodes of G, G.adj[node] would make
+        # a view for every node, which takes most of the time on sparse graphs
+        rows = list(G._adj.values())
+        degrees = np.fromiter(map(len, rows), np.int64, n)
+        offsets = _offsets_from_degrees(degrees)
+        dtype = _index_dtype(n)
+
+        neighbors = chain.from_iterable(rows)
+        if labels != list(range(n)):
+            index = {node: i for i, node in enumerate(labels)}
+            neighbors = (index[neighbor] for neighbor in neighbors)
+        else:
+            labels = None  # nodes are already 0..n-1
+        adjacency = np.fromiter(neighbors, dtype, int(offsets[-1]))
+
+        return cls.from_csr(offsets, adjacency, labels)
+
+    @classmethod
+    def from_edge_list(cls, edges, number_of_nodes=None):
+        """
+        Creates graph from iterable of (u, v) pairs of integer nodes.
+        Self loops and repeated edges are dropped, neighbors end up sorted.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if number_of_nodes is None:
+            number_of_nodes = int(edges.max()) + 1 if len(edges) else 0
+        n = number_of_nodes
+
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        # every edge is stored in both directions
+        rows = np.concatenate((edges[:, 0], edges[:, 1]))
+        columns = np.concatenate((edges[:, 1], edges[:, 0]))
+        # unique over row * n + column both sorts and removes repeated edges
+        keys = np.unique(rows * n + columns)
+        rows, columns = np.divmod(keys, n)
+
+        offsets = _offsets_from_degrees(np.bincount(rows, minlength=n))
+        return cls.from_csr(offsets, columns.astype(_index_dtype(n)))
+
+    @classmethod
+    def from_adjacency_matrix(cls, matrix):
+        """
+        Creates graph from square adjacency matrix, any nonzero entry is an edge.
+        """
+        matrix = np.asarray(matrix)
+        assert (
+            matrix.ndim == 2 and matrix.shape[0] == matrix.shape[1]
+        ), "adjacency matrix has to be square"
+        rows, columns = np.nonzero((matrix != 0) | (matrix.T != 0))
+        return cls.from_edge_list(np.column_stack((rows, columns)), len(matrix))
+
+    @classmethod
+    def from_adjacency_list(cls, adjacency_list):
+        """
+        Creates graph from list of neighbor lists, adjacency_list[v] are neighbors of v.
+        """
+        edges = [(v, u) for v, neighbors in enumerate(adjacency_list) for u in neighbors]
+        return cls.from_edge_list(edges, len(adjacency_list))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Opens graph saved with save, with mmap=True arrays are memory-mapped
+        instead of read, so opening takes constant time and memory.
+        """
+        mmap_mode = "r" if mmap else None
+        offsets = np.load(os.path.join(directory, "offsets.npy"), mmap_mode=mmap_mode)
+        adjacency = np.load(os.path.join(directory, "adjacency.npy"), mmap_mode=mmap_mode)
+        labels = None
+        labels_path = os.path.join(directory, "labels.pkl")
+        if os.path.exists(labels_path):
+            with open(labels_path, "rb") as file:
+                labels = pickle.load(file)
+        return cls.from_csr(offsets, adjacency, labels)
+
+    def save(self, directory):
+        """
+        Saves arrays of graph as .npy files in directory (labels are pickled).
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "offsets.npy"), self.offsets)
+        np.save(os.path.join(directory, "adjacency.npy"), self.adjacency)
+        if self.labels is not None:
+            with open(os.path.join(directory, "labels.pkl"), "wb") as file:
+                pickle.dump(self.labels, file)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(range(self.size))
+
+    def __contains__(self, node):
+        return 0 <= node < self.size
 
     def number_of_nodes(self):
         return self.size
 
+    def number_of_edges(self):
+        return len(self.adjacency) // 2
+
+    def nodes(self):
+        return range(self.size)
+
     def nodes_iter(self):
-        pass
+        return iter(range(self.size))
 
-    def all_neighbors(self):
-        pass
+    def neighbors(self, node):
+        # list of python ints is much faster to iterate over than numpy array
+        return self.adjacency[self.offsets[node] : self.offsets[node + 1]].tolist()
 
-    def common_neighbors(self):
-        pass
+    def all_neighbors(self, node):
+        return self.neighbors(node)
 
-    def non_neighbors(self):
-        pass
+    def degree(self, node=None):
+        """
+        Returns degree of node, or array of degrees of all nodes if node is None.
+        """
+        if node is None:
+            return np.diff(self.offsets)
+        return int(self.offsets[node + 1] - self.offsets[node])
 
-    def nodes(self):
-        pass
+    def has_edge(self, u, v):
+        return v in self.adjacency[self.offsets[u] : self.offsets[u + 1]]
+
+    def common_neighbors(self, u, v):
+        return np.intersect1d(
+            self.adjacency[self.offsets[u] : self.offsets[u + 1]],
+            self.adjacency[self.offsets[v] : self.offsets[v + 1]],
+        ).tolist()
+
+    def non_neighbors(self, node):
+        is_neighbor = np.zeros(self.size, dtype=bool)
+        is_neighbor[self.adjacency[self.offsets[node] : self.offsets[node + 1]]] = True
+        is_neighbor[node] = True
+        return np.flatnonzero(~is_neighbor).tolist()
+
+    def to_networkx(self):
+        """
+        Returns networkx graph with the same nodes (labels if graph has them) and edges.
+        """
+        G = nx.Graph()
+        labels = self.labels if self.labels is not None else range(self.size)
+        G.add_nodes_from(labels)
+        edges = self.edges()
+        if self.labels is not None:
+            edges = ((labels[u], labels[v]) for u, v in edges)
+        G.add_edges_from(edges)
+        return G
+
+    def edges(self):
+        """
+        Returns list of edges (u, v) with u < v.
+        """
+        rows = np.repeat(np.arange(self.size), self.degree())
+        upper = rows < self.adjacency
+        return list(zip(rows[upper].tolist(), self.adjacency[upper].tolist()))
+
+    def nbytes(self):
+        return self.offsets.nbytes + self.adjacency.nbytes
+
+
+def _index_dtype(n):
+    # node indices fit in 4 bytes for all graphs we can hold in memory anyway
+    return np.int32 if n < 2**31 else np.int64
+
+
+def _offsets_from_degrees(degrees):
+    offsets = np.zeros(len(degrees) + 1, dtype=np.int64)
+    np.cumsum(degrees, out=offsets[1:])
+    return offsets
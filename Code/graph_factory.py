@@ -0,0 +1,179 @@
+import os
+import numpy as np
+from eviction import evict_least_recently_used
+from graph import Graph, _index_dtype, _offsets_from_degrees
+
+# generated graphs are kept here as .npz files, see generate
+CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".graph_cache")
+
+# least recently used files of cache are removed when they take more than that
+MAX_CACHE_BYTES = 1 << 30
+
+# rounds of swaps in random_regular before stubs are paired again
+REPAIR_ROUNDS = 100
+
+
+def generate(family, n, seed=0, cache_directory=CACHE_DIRECTORY, **parameters):
+    """
+    Returns graph.Graph of family (name of a generator of this module: gnp,
+    random_regular, planar_mesh, power_law) with n nodes and given parameters,
+    e.g. generate("gnp", 1000, p=0.5, seed=1). Graphs are cached as .npz files in
+    cache_directory keyed by family, n, parameters and seed (None disables caching),
+    at most MAX_CACHE_BYTES of them, the same arguments always give the same graph.
+    """
+    generator = FAMILIES[family]
+    if cache_directory is None:
+        return generator(n, seed=seed, **parameters)
+
+    name = "_".join(
+        [family, str(n)] + [f"{key}={parameters[key]}" for key in sorted(parameters)]
+    )
+    path = os.path.join(cache_directory, f"{name}_seed={seed}.npz")
+    try:
+        with np.load(path) as arrays:
+            graph = Graph.from_csr(arrays["offsets"], arrays["adjacency"])
+        os.utime(path)  # file modification time is used as last access time
+        return graph
+    except (FileNotFoundError, ValueError, KeyError):  # missing or half written
+        pass
+
+    graph = generator(n, seed=seed, **parameters)
+    os.makedirs(cache_directory, exist_ok=True)
+    # written to temporary file first, so other processes never read half of it
+    with open(path + ".tmp", "wb") as file:
+        np.savez(file, offsets=graph.offsets, adjacency=graph.adjacency)
+    os.replace(path + ".tmp", path)
+    evict_least_recently_used(cache_directory, ".npz", MAX_CACHE_BYTES)
+    return graph
+
+
+def gnp(n, p, seed=0):
+    """
+    Erdos-Renyi G(n, p) graph. Instead of drawing a number for every pair of nodes,
+    gaps between consecutive edges in list of all pairs are drawn from geometric
+    distribution (Batagelj and Brandes), so it takes O(n + m) time.
+    """
+    rng = np.random.default_rng(seed)
+    pairs = n * (n - 1) // 2
+    if p <= 0 or pairs == 0:
+        return _from_pairs(n, np.zeros(0, dtype=np.int64))
+
+    indices = []
+    last = -1
+    while last < pairs:
+        # a bit more gaps than expected, so usually one batch is enough
+        batch = int((pairs - last) * p * 1.05) + 100
+        positions = last + np.cumsum(rng.geometric(p, size=batch))
+        indices.append(positions)
+        last = int(positions[-1])
+    indices = np.concatenate(indices)
+    return _from_pairs(n, indices[indices < pairs])
+
+
+def random_regular(n, d, seed=0):
+    """
+    Random d-regular graph, stubs of nodes are paired in random order (configuration
+    model) and self loops and repeated edges are removed by swapping ends with random
+    edges, all pairs with problems are fixed at once. When that does not succeed in
+    REPAIR_ROUNDS rounds, stubs are paired again. For d > (n - 1) / 2 it is complement
+    of random (n - 1 - d)-regular graph, swaps rarely succeed in so dense graphs.
+    """
+    if n * d % 2 or d >= n:
+        raise ValueError("n * d must be even and d smaller than n")
+    if 2 * d > n - 1:
+        return _complement(random_regular(n, n - 1 - d, seed))
+    rng = np.random.default_rng(seed)
+    while True:
+        edges = rng.permutation(np.repeat(np.arange(n), d)).reshape(-1, 2)
+        for _ in range(REPAIR_ROUNDS):
+            low, high = edges.min(axis=1), edges.max(axis=1)
+            keys = low * n + high
+            order = np.argsort(keys, kind="stable")
+            repeated = np.zeros(len(keys), dtype=bool)
+            repeated[order[1:]] = keys[order[1:]] == keys[order[:-1]]
+            bad = np.flatnonzero(repeated | (low == high))
+            if len(bad) == 0:
+                return Graph.from_edge_list(edges, n)
+            if 2 * len(bad) > len(edges):  # not enough good edges to swap with
+                break
+            # (a, b), (c, d) -> (a, d), (c, b) with distinct edges (c, d), so degrees stay d
+            good = np.ones(len(edges), dtype=bool)
+            good[bad] = False
+            others = rng.choice(np.flatnonzero(good), size=len(bad), replace=False)
+            edges[bad, 1], edges[others, 1] = edges[others, 1], edges[bad, 1]
+
+
+def planar_mesh(n, seed=0):
+    """
+    Triangulated grid with about n nodes (side is the integer square root of n),
+    every cell is split by one of its diagonals chosen at random, so it is planar
+    with degrees up to 8.
+    """
+    rng = np.random.default_rng(seed)
+    side = max(int(np.sqrt(n)), 1)
+    nodes = np.arange(side * side).reshape(side, side)
+    cells = nodes[:-1, :-1].ravel()
+    flip = rng.random(len(cells)) < 0.5
+    edges = [
+        np.column_stack((nodes[:, :-1].ravel(), nodes[:, 1:].ravel())),  # horizontal
+        np.column_stack((nodes[:-1, :].ravel(), nodes[1:, :].ravel())),  # vertical
+        np.column_stack(
+            (
+                np.where(flip, cells + 1, cells),
+                np.where(flip, cells + side, cells + side + 1),
+            )
+        ),
+    ]
+    return Graph.from_edge_list(np.concatenate(edges), side * side)
+
+
+def power_law(n, average_degree=8, exponent=2.5, seed=0):
+    """
+    Chung-Lu graph whose degrees follow power law with given exponent: node i has
+    weight proportional to (i + 1) ** (-1 / (exponent - 1)) and both ends of
+    n * average_degree / 2 edges are drawn with probability proportional to weights
+    (self loops and repeated edges are dropped, so the average degree is a bit smaller).
+    """
+    rng = np.random.default_rng(seed)
+    weights = (np.arange(n) + 1.0) ** (-1 / (exponent - 1))
+    weights /= weights.sum()
+    m = n * average_degree // 2
+    edges = rng.choice(n, size=(m, 2), p=weights)
+    return Graph.from_edge_list(edges, n)
+
+
+def _complement(graph):
+    n = len(graph)
+    matrix = np.ones((n, n), dtype=bool)
+    matrix[np.repeat(np.arange(n), graph.degree()), graph.adjacency] = False
+    np.fill_diagonal(matrix, False)
+    # matrix is symmetric, its rows are already sorted neighbor lists
+    offsets = _offsets_from_degrees(matrix.sum(axis=1))
+    return Graph.from_csr(offsets, np.nonzero(matrix)[1].astype(_index_dtype(n)))
+
+
+def _from_pairs(n, indices):
+    """
+    Returns graph with edges given as indices of pairs (u, v), u < v in order
+    (0, 1), (0, 2), (1, 2), (0, 3), ... where pair (u, v) has index v(v-1)/2 + u.
+    """
+    v = ((1 + np.sqrt(1 + 8 * indices.astype(np.float64))) / 2).astype(np.int64)
+    # square root of big numbers can be off by one
+    v -= v * (v - 1) // 2 > indices
+    v += (v + 1) * v // 2 <= indices
+    u = indices - v * (v - 1) // 2
+
+    # every edge in both directions, rows sorted, as edges are sorted by v and then u
+    rows = np.concatenate((v, u))
+    columns = np.concatenate((u, v))
+    order = np.argsort(rows, kind="stable")
+    offsets = _offsets_from_degrees(np.bincount(rows, minlength=n))
+    return Graph.from_csr(offsets, columns[order].astype(_index_dtype(n)))
+
+
+FAMILIES = {
+    "gnp": gnp,
+    "random_regular": random_regular,
+    "planar_mesh": planar_mesh,
+    "power_law": power_law,
+}
@@ -0,0 +1,132 @@
+import os
+import warnings
+import numpy as np
+from graph import Graph, _index_dtype, _offsets_from_degrees
+
+# binary edge list is a flat file of little-endian uint32 pairs u, v
+BINARY_DTYPE = np.dtype("<u4")
+
+
+def load_edge_list(path, directory=None, binary=None, chunk_edges=1 << 20):
+    """
+    Streams edge list file into CSR graph.Graph, reading at most chunk_edges edges at a time.
+    Text files have one edge "u v" per line (further columns and lines starting
+    with # or % are ignored), binary files are pairs of uint32 (see BINARY_DTYPE),
+    by default format is guessed from .bin extension. Nodes are integers 0..n-1 where
+    n - 1 is the biggest node in file. Self loops and repeated edges are dropped.
+    If directory is given, arrays are built in memory-mapped files there and the graph
+    can be reopened later with graph.Graph.load(directory) without parsing the file again.
+    """
+    if binary is None:
+        binary = path.endswith(".bin")
+
+    # first pass: degrees, so that every node gets its place in adjacency array,
+    # nodes seen only in self loops are nodes of the graph too
+    degrees = np.zeros(0, dtype=np.int64)
+    for edges in _edge_chunks(path, binary, chunk_edges, self_loops=True):
+        size = int(edges.max()) + 1 if len(edges) else 0
+        if size > len(degrees):
+            degrees = np.concatenate((degrees, np.zeros(size - len(degrees), np.int64)))
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        counts = np.bincount(edges.ravel())
+        degrees[: len(counts)] += counts
+    n = len(degrees)
+    offsets = _offsets_from_degrees(degrees)
+
+    # second pass: neighbors written at the next free place of their row
+    adjacency = _empty_array(directory, "adjacency_unsorted.npy", offsets[-1], _index_dtype(n))
+    next_free = offsets[:-1].copy()
+    for edges in _edge_chunks(path, binary, chunk_edges):
+        rows = np.concatenate((edges[:, 0], edges[:, 1]))
+        columns = np.concatenate((edges[:, 1], edges[:, 0]))
+        order = np.argsort(rows)
+        rows, columns = rows[order], columns[order]
+
+        # position of every edge among edges of the same row in this chunk
+        group_starts = np.flatnonzero(np.diff(rows, prepend=-1))
+        group_sizes = np.diff(group_starts, append=len(rows))
+        rank = np.arange(len(rows)) - np.repeat(group_starts, group_sizes)
+        adjacency[next_free[rows] + rank] = columns
+        next_free[rows[group_starts]] += group_sizes
+
+    # third pass: sort every row and drop repeated neighbors, compacting array in place
+    new_offsets = np.zeros(n + 1, dtype=np.int64)
+    written = 0
+    block_bounds = np.unique(
+        np.append(np.searchsorted(offsets, np.arange(0, offsets[-1], chunk_edges)), n)
+    )
+    for first, last in zip(block_bounds[:-1], block_bounds[1:]):
+        block = np.array(adjacency[offsets[first] : offsets[last]], dtype=np.int64)
+        rows = np.repeat(np.arange(last - first), degrees[first:last])
+        keys = rows * n + block
+        keys.sort()
+        keys = keys[np.diff(keys, prepend=-1) != 0]  # sorted without repeats
+        rows, columns = np.divmod(keys, n)
+        adjacency[written : written + len(columns)] = columns
+        new_offsets[first + 1 : last + 1] = written + np.cumsum(
+            np.bincount(rows, minlength=last - first)
+        )
+        written += len(columns)
+
+    if directory is None:
+        return Graph.from_csr(new_offsets, adjacency[:written].copy())
+
+    final_adjacency = _empty_array(directory, "adjacency.npy", written, adjacency.dtype)
+    for start in range(0, written, chunk_edges):
+        stop = min(start + chunk_edges, written)
+        final_adjacency[start:stop] = adjacency[start:stop]
+    final_adjacency.flush()
+    del adjacency, final_adjacency
+    os.remove(os.path.join(directory, "adjacency_unsorted.npy"))
+    np.save(os.path.join(directory, "offsets.npy"), new_offsets)
+    return Graph.load(directory)
+
+
+def write_binary_edge_list(edges, path):
+    """
+    Writes iterable of (u, v) pairs as binary edge list readable by load_edge_list.
+    """
+    np.asarray(edges, dtype=BINARY_DTYPE).reshape(-1, 2).tofile(path)
+
+
+def _edge_chunks(path, binary, chunk_edges, self_loops=False):
+    """
+    Yields arrays of shape (k, 2) with at most about chunk_edges edges, without self
+    loops unless self_loops is True.
+    """
+    if binary:
+        if os.path.getsize(path) == 0:  # empty file can not be memory-mapped
+            return
+        all_edges = np.memmap(path, dtype=BINARY_DTYPE, mode="r").reshape(-1, 2)
+        chunks = (
+            np.asarray(all_edges[start : start + chunk_edges], dtype=np.int64)
+            for start in range(0, len(all_edges), chunk_edges)
+        )
+    else:
+        chunks = _text_chunks(path, chunk_edges)
+
+    for edges in chunks:
+        yield edges if self_loops else edges[edges[:, 0] != edges[:, 1]]
+
+
+def _text_chunks(path, chunk_edges):
+    with open(path) as file:
+        while True:
+            lines = file.readlines(chunk_edges * 16)  # roughly 16 bytes per line
+            if not lines:
+                return
+            with warnings.catch_warnings():  # chunk with comments only is not an error
+                warnings.simplefilter("ignore", UserWarning)
+                edges = np.loadtxt(
+                    lines, dtype=np.int64, comments=("#", "%"), usecols=(0, 1), ndmin=2
+                )
+            yield edges
+
+
+def _empty_array(directory, name, size, dtype):
+    if directory is None:
+        return np.empty(size, dtype=dtype)
+    os.makedirs(directory, exist_ok=True)
+    return np.lib.format.open_memmap(
+        os.path.join(directory, name), mode="w+", dtype=dtype, shape=(int(size),)
+    )
@@ -0,0 +1,189 @@
+"""
+Parallel Jones-Plassmann coloring.
+
+python jones_plassmann.py [-n N] [-p P]    benchmark of scaling with number of processes
+"""
+
+import argparse
+import os
+from multiprocessing import Pool, shared_memory
+from time import perf_counter
+import numpy as np
+from graph_factory import generate
+from relabeling import labeled_coloring, relabel
+
+# arrays of the graph and of the coloring kept in shared memory
+SHARED_ARRAYS = ("offsets", "adjacency", "colors", "counters")
+
+# state of worker process, set by _init_worker
+_worker = {}
+
+
+def jones_plassmann(G, processes=None, priority="random", seed=0, trace=None):
+    """
+    Jones-Plassmann coloring of G (networkx or graph.Graph). In every round each
+    uncolored node with higher priority than all its uncolored neighbors gets the
+    smallest color not used by its neighbors, such nodes are independent, so they are
+    colored at once. Every node counts its uncolored neighbors of higher priority.
+    Nodes are split into slices colored by a pool of processes, graph and colors are
+    kept in multiprocessing.shared_memory arrays. Uncolored neighbors of nodes colored
+    by a slice are sent to slices they belong to, which decrease their counters in the
+    next round, so work of a slice is proportional to edges of its own nodes.
+    priority is "random" (random order, like random_sequential) or "largest_first"
+    (higher degree first, ties broken at random), seed makes priorities repeatable.
+    trace gets node event for the first node colored in every round.
+    """
+    graph, labels = relabel(G)
+    n = len(graph)
+    if n == 0:
+        return {}, 0
+
+    rng = np.random.default_rng(seed)
+    priorities = rng.permutation(n).astype(np.int64)  # all different
+    if priority == "largest_first":
+        priorities += graph.degree().astype(np.int64) * n
+    elif priority != "random":
+        raise ValueError(f"unknown priority {priority}")
+
+    # node is colored when its last neighbor of higher priority is colored
+    owners = np.repeat(np.arange(n), graph.degree())
+    higher = priorities[graph.adjacency] > priorities[owners]
+    arrays = {
+        "offsets": graph.offsets,
+        "adjacency": graph.adjacency,
+        "colors": np.zeros(n, dtype=np.int64),  # 0 means not colored yet
+        "counters": np.bincount(owners[higher], minlength=n),  # uncolored higher neighbors
+    }
+    blocks, layout = {}, {}
+    try:
+        for name in SHARED_ARRAYS:
+            array = arrays[name]
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[:] = array
+            blocks[name] = block
+            layout[name] = (block.name, array.shape, array.dtype.str)
+
+        # one slice per process, every round costs each slice a few numpy calls,
+        # random priorities spread nodes colored in a round evenly over slices anyway
+        size = -(-n // (processes or os.cpu_count() or 1))
+        starts = np.arange(0, n, size)
+        if processes == 1:
+            _init_worker(layout)
+            _run_rounds(map, starts, n, trace)
+        else:
+            with Pool(processes, initializer=_init_worker, initargs=(layout,)) as pool:
+                _run_rounds(pool.map, starts, n, trace)
+        colors = np.ndarray(n, np.int64, buffer=blocks["colors"].buf).copy()
+    finally:
+        _worker.clear()
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+    return labeled_coloring(colors, labels), int(colors.max())
+
+
+def jones_plassmann_largest_first(G, processes=None, seed=0, trace=None):
+    return jones_plassmann(G, processes, "largest_first", seed, trace)
+
+
+def _run_rounds(map_function, starts, n, trace):
+    size = int(starts[1]) if len(starts) > 1 else n  # all slices but the last one
+    stops = np.append(starts[1:], n)
+    incoming = [None] * len(starts)  # the first round colors nodes with counter 0
+    colored = 0
+    while colored < n:
+        if trace is not None:
+            trace.node(colored)
+        tasks = list(zip(starts.tolist(), stops.tolist(), incoming))
+        results = list(map_function(_color_slice, tasks))
+        colored += sum(count for count, _ in results)
+        # targets of all slices split by slice they belong to
+        targets = np.concatenate([slice_targets for _, slice_targets in results])
+        slice_numbers = (targets // size).astype(np.int32)
+        order = np.argsort(slice_numbers, kind="stable")
+        bounds = np.searchsorted(slice_numbers[order], np.arange(1, len(starts)))
+        incoming = np.split(targets[order], bounds)
+
+
+def _init_worker(layout):
+    for name, (block_name, shape, dtype) in layout.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker[name + "_block"] = block  # array is valid as long as block is open
+        _worker[name] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+
+
+def _color_slice(task):
+    """
+    Decreases counters of nodes of slice start..stop-1 once for every neighbor in
+    incoming (uncolored neighbors of nodes colored in the previous round), colors
+    nodes whose counters drop to 0 (the local maxima of priority among uncolored
+    nodes) and returns their number and their uncolored neighbors.
+    Slice changes only its own counters and colors, so slices can be colored in any
+    order or at the same time.
+    """
+    start, stop, incoming = task
+    colors, counters = _worker["colors"], _worker["counters"]
+
+    if incoming is None:
+        nodes = start + np.flatnonzero(counters[start:stop] == 0)
+    else:
+        np.subtract.at(counters, incoming, 1)
+        nodes = np.unique(incoming[counters[incoming] == 0])
+    if len(nodes) == 0:
+        return 0, nodes
+
+    # smallest color missing among colors of neighbors (colored in earlier rounds),
+    # colors of every node sorted without repeats are compared with 1, 2, 3, ...
+    owners, neighbors = _neighbors(nodes)
+    neighbor_colors = colors[neighbors]
+    done = neighbor_colors > 0
+    base = int(neighbor_colors.max(initial=0)) + 2
+    keys = np.unique(owners[done] * base + neighbor_colors[done])
+    owner, color = np.divmod(keys, base)
+    group_starts = np.flatnonzero(np.diff(owner, prepend=-1))
+    group_sizes = np.diff(group_starts, append=len(owner))
+    rank = np.arange(len(owner)) - np.repeat(group_starts, group_sizes) + 1
+    missing = np.bincount(owner, minlength=len(nodes)) + 1  # all colors 1..k used
+    gaps = color != rank
+    np.minimum.at(missing, owner[gaps], rank[gaps])
+    colors[nodes] = missing
+
+    # uncolored neighbors have lower priority, none of them is colored in this round
+    return len(nodes), neighbors[~done]
+
+
+def _neighbors(nodes):
+    """
+    Returns index in nodes of owner of every neighbor entry and the neighbors,
+    all neighbors of nodes[0], then of nodes[1] and so on.
+    """
+    offsets, adjacency = _worker["offsets"], _worker["adjacency"]
+    degrees = offsets[nodes + 1] - offsets[nodes]
+    owners = np.repeat(np.arange(len(nodes)), degrees)
+    positions = np.repeat(offsets[nodes] - np.cumsum(degrees) + degrees, degrees)
+    return owners, adjacency[positions + np.arange(len(owners))]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=100000)
+    parser.add_argument("-p", type=float, default=None, help="default 100 / n")
+    arguments = parser.parse_args()
+
+    G = generate("gnp", arguments.n, p=arguments.p or 100 / arguments.n, seed=2137)
+    edges = G.edges()
+    base_time = None
+    for processes in [1, 2, 4, 8]:
+        start = perf_counter()
+        coloring, number_of_colors_used = jones_plassmann(G, processes)
+        elapsed = perf_counter() - start
+        base_time = base_time or elapsed
+        for edge in edges:
+            assert (
+                coloring[edge[0]] != coloring[edge[1]]
+            ), "jones_plassmann created invalid coloring, two adjacent nodes have the same color"
+        print(
+            f"{processes} processes: {elapsed:.2f}s (speedup {base_time / elapsed:.2f}x), "
+            f"{number_of_colors_used} colors"
+        )
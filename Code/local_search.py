@@ -0,0 +1,250 @@
+import random
+from time import perf_counter
+import networkx as nx
+import numpy as np
+from coloring_algorithms import _greedy, largest_first
+from lower_bounds import lower_bound
+from relabeling import labeled_coloring, relabel
+
+# change of number of conflicts given to moves that can not be made
+FORBIDDEN = np.iinfo(np.int64).max
+
+
+def iterated_greedy(G, coloring, time_limit=1.0, target=None, rng=None):
+    """
+    Improves coloring of G (networkx or graph.Graph) by iterated greedy of Culberson:
+    nodes are ordered by color classes (classes in reverse, by decreasing size or in
+    random order) and colored again with _greedy, which never uses more colors than
+    there are classes. Returns the best coloring and number of its colors, found in
+    time_limit seconds or earlier, when it uses at most target colors (by default
+    lower bound of lower_bounds module). rng is random.Random, global random by default.
+    """
+    rng = random if rng is None else rng
+    deadline = perf_counter() + time_limit
+    graph, labels, colors = _to_arrays(G, coloring)
+    if target is None:
+        target = lower_bound(graph)
+    target = max(target, 1)
+    best_colors, best = colors, int(colors.max(initial=0))
+
+    while best > target and perf_counter() < deadline:
+        classes = [
+            np.flatnonzero(colors == color).tolist() for color in range(1, colors.max() + 1)
+        ]
+        strategy = rng.random()
+        if strategy < 0.4:
+            classes.reverse()
+        elif strategy < 0.8:
+            classes.sort(key=len, reverse=True)
+        else:
+            rng.shuffle(classes)
+        order = [node for color_class in classes for node in color_class]
+
+        node_colors, number_of_colors_used = _greedy(graph, order)
+        colors = np.empty(len(graph), dtype=np.int64)
+        colors[list(node_colors)] = list(node_colors.values())
+        if number_of_colors_used < best:
+            best_colors, best = colors, number_of_colors_used
+
+    return labeled_coloring(best_colors, labels), best
+
+
+def tabucol(
+    G, coloring, time_limit=1.0, target=None, rng=None, tenure=10, alpha=0.6, callback=None
+):
+    """
+    Improves coloring of G (networkx or graph.Graph) with TabuCol of Hertz and de Werra:
+    nodes of the last color are moved to other colors and conflicts (edges with both
+    ends of the same color) are removed by moving conflicting nodes to the color
+    that removes most of them, moving node back to its color is forbidden for
+    rng.randrange(tenure) + alpha * number of conflicting nodes moves.
+    When there are no conflicts, the next color is removed. Returns the best proper coloring and number
+    of its colors, found in time_limit seconds or earlier, when it uses at most target
+    colors (by default lower bound of lower_bounds module).
+    callback(number_of_colors) is called after every removed color, when it returns
+    True search stops.
+    """
+    rng = random if rng is None else rng
+    deadline = perf_counter() + time_limit
+    graph, labels, colors = _to_arrays(G, coloring)
+    if target is None:
+        target = lower_bound(graph)
+    best_colors, best = _tabucol(
+        graph, colors, deadline, max(target, 1), rng, tenure, alpha, callback
+    )
+    return labeled_coloring(best_colors, labels), best
+
+
+def _tabucol(graph, colors, deadline, target, rng, tenure=10, alpha=0.6, callback=None):
+    """
+    tabucol on array of colors 1..k of nodes 0..n-1 of CSR graph, returns the best
+    array of colors and number of its colors.
+    """
+    best_colors, best = colors, int(colors.max(initial=0))
+    search = None  # built once, colors are removed from it one by one
+    while best > target and perf_counter() < deadline:
+        if search is None:
+            search = _ConflictSearch(graph, best_colors - 1, best, rng)
+        if not search.remove_color(deadline) or not search.run(deadline, tenure, alpha):
+            break
+        best_colors, best = search.colors + 1, best - 1
+        if callback is not None and callback(best):
+            break
+    return best_colors, best
+
+
+class _ConflictSearch:
+    """
+    Tabu search for coloring with number_of_colors colors (0..number_of_colors - 1).
+    gamma[node, color] is the number of neighbors of node with color, so node is in
+    conflict when gamma[node, colors[node]] > 0. Conflicting nodes are kept in array
+    with their positions, so moving a node updates everything in O(degree).
+    """
+
+    __slots__ = [
+        "graph",
+        "colors",
+        "gamma",
+        "tabu",
+        "conflicting",
+        "positions",
+        "size",
+        "conflicts",
+        "rng",
+    ]
+
+    def __init__(self, graph, colors, number_of_colors, rng) -> None:
+        n = len(graph)
+        self.graph = graph
+        self.rng = rng
+        self.colors = colors.copy()
+        rows = np.repeat(np.arange(n), graph.degree())
+        self.gamma = np.bincount(
+            rows * number_of_colors + self.colors[graph.adjacency],
+            minlength=n * number_of_colors,
+        ).astype(np.int32).reshape(n, number_of_colors)
+        self.conflicting = np.zeros(n, dtype=np.int64)
+        self.positions = np.full(n, -1, dtype=np.int64)  # -1 for nodes not in conflict
+        self._start()
+
+    def remove_color(self, deadline):
+        """
+        Moves nodes of the last color where they have fewest neighbors, returns False
+        when deadline comes first (there may be a lot of them, moved one by one).
+        """
+        number_of_colors = self.gamma.shape[1] - 1
+        for node in np.flatnonzero(self.colors == number_of_colors).tolist():
+            if perf_counter() > deadline:
+                return False
+            color = int(self.gamma[node, :number_of_colors].argmin())
+            self.colors[node] = color
+            self.gamma[self._neighbors(node), number_of_colors] -= 1
+            self.gamma[self._neighbors(node), color] += 1
+        self.gamma = np.ascontiguousarray(self.gamma[:, :number_of_colors])
+        self._start()
+        return True
+
+    def _start(self):
+        n, number_of_colors = self.gamma.shape
+        self.tabu = np.zeros((n, number_of_colors), dtype=np.int64)
+        self.positions[:] = -1
+        own = self.gamma[np.arange(n), self.colors]
+        nodes = np.flatnonzero(own)
+        self.size = len(nodes)
+        self.conflicting[: self.size] = nodes
+        self.positions[nodes] = np.arange(self.size)
+        self.conflicts = int(own.sum()) // 2
+
+    def run(self, deadline, tenure, alpha):
+        """
+        Returns True when coloring without conflicts is found before deadline.
+        """
+        best_conflicts = self.conflicts
+        iteration = 0
+        while self.conflicts > 0:
+            iteration += 1
+            # with many colors or conflicts a single iteration takes long
+            if perf_counter() > deadline:
+                return False
+
+            # change of number of conflicts for every move of conflicting node
+            nodes = self.conflicting[: self.size]
+            own_colors = self.colors[nodes]
+            deltas = self.gamma[nodes].astype(np.int64)
+            deltas -= deltas[np.arange(self.size), own_colors][:, None]
+            # tabu moves are allowed only when they give the best coloring so far
+            forbidden = (self.tabu[nodes] > iteration) & (
+                self.conflicts + deltas >= best_conflicts
+            )
+            forbidden[np.arange(self.size), own_colors] = True
+            deltas[forbidden] = FORBIDDEN
+            flat = deltas.ravel()
+            candidates = np.flatnonzero(flat == flat.min())
+            move = int(candidates[self.rng.randrange(len(candidates))])
+            i, color = divmod(move, deltas.shape[1])
+            if deltas[i, color] == FORBIDDEN:
+                continue  # every move is tabu
+
+            node = int(nodes[i])
+            old_color = int(self.colors[node])
+            self.tabu[node, old_color] = (
+                iteration + self.rng.randrange(tenure) + int(alpha * self.size)
+            )
+            self._move(node, old_color, color)
+            self.conflicts += int(deltas[i, color])
+            best_conflicts = min(best_conflicts, self.conflicts)
+        return True
+
+    def _move(self, node, old_color, color):
+        neighbors = self._neighbors(node)
+        self.colors[node] = color
+        self.gamma[neighbors, old_color] -= 1
+        self.gamma[neighbors, color] += 1
+        # only node and its neighbors of old and new color can change conflict state
+        affected = neighbors[
+            (self.colors[neighbors] == old_color) | (self.colors[neighbors] == color)
+        ]
+        for changed in [node] + affected.tolist():
+            in_conflict = self.gamma[changed, self.colors[changed]] > 0
+            if in_conflict and self.positions[changed] < 0:
+                self._add(changed)
+            elif not in_conflict and self.positions[changed] >= 0:
+                self._remove(changed)
+
+    def _add(self, node):
+        self.conflicting[self.size] = node
+        self.positions[node] = self.size
+        self.size += 1
+
+    def _remove(self, node):
+        # last conflicting node takes place of removed one
+        position = self.positions[node]
+        self.size -= 1
+        last = self.conflicting[self.size]
+        self.conflicting[position] = last
+        self.positions[last] = position
+        self.positions[node] = -1
+
+    def _neighbors(self, node):
+        offsets = self.graph.offsets
+        return self.graph.adjacency[offsets[node] : offsets[node + 1]]
+
+
+def _to_arrays(G, coloring):
+    """
+    Returns CSR graph, labels of relabel and colors of coloring as array.
+    """
+    graph, labels = relabel(G)
+    nodes = range(len(graph)) if labels is None else labels
+    colors = np.array([coloring[node] for node in nodes], dtype=np.int64)
+    return graph, labels, colors
+
+
+if __name__ == "__main__":
+    for p in [0.1, 0.5, 0.9]:
+        G = nx.gnp_random_graph(500, p, seed=2137)
+        coloring, number_of_colors_used = largest_first(G)
+        print(f"p={p}: largest_first {number_of_colors_used} colors")
+        for improve in [iterated_greedy, tabucol]:
+            _, improved = improve(G, coloring, time_limit=5, rng=random.Random(2137))
+            print(f"    {improve.__name__} {improved} colors")
@@ -0,0 +1,106 @@
+import numpy as np
+from graph import Graph
+from coloring_algorithms import smallest_last_ordering
+
+
+def lower_bound(G):
+    """
+    Returns the best of lower_bounds(G), chromatic number of G is at least that big.
+    """
+    return max(lower_bounds(G).values(), default=0)
+
+
+def lower_bounds(G, order=None, degeneracy=None, clique=None):
+    """
+    Returns dict name: lower bound on chromatic number of G (networkx or graph.Graph).
+    clique - size of greedy_clique,
+    density - Turan bound n^2 / (n^2 - 2m) (every graph this dense has such clique),
+    fractional - n / alpha with independence number alpha <= n - m / max_degree,
+    degeneracy_core - the better of the two above for the densest core of G
+    (nodes left in smallest_last ordering when degeneracy is reached), as chromatic
+    number of G is at least the one of its subgraph.
+    All of them take O(n + m) time, apart from the clique which takes O(m * degeneracy).
+    For CSR graph order and degeneracy from smallest_last_ordering and clique from
+    greedy_clique can be given when they are already computed.
+    """
+    graph = G if isinstance(G, Graph) else Graph.from_networkx(G)
+    if len(graph) == 0:
+        return {}
+    if order is None:
+        order, degeneracy = smallest_last_ordering(graph)
+    if clique is None:
+        clique = greedy_clique(graph, order, degeneracy)
+
+    bounds = {"clique": len(clique)}
+    degrees = graph.degree()
+    bounds["density"] = _density_bound(len(graph), graph.number_of_edges())
+    bounds["fractional"] = _fractional_bound(
+        len(graph), graph.number_of_edges(), int(degrees.max())
+    )
+
+    # degree of every node at its removal is the number of neighbors removed later
+    positions = np.empty(len(graph), dtype=np.int64)
+    positions[order] = np.arange(len(graph))
+    rows = np.repeat(np.arange(len(graph)), degrees)
+    later = positions[graph.adjacency] > positions[rows]
+    removal_degrees = np.bincount(rows[later], minlength=len(graph))
+    # once smallest degree reaches degeneracy, all remaining nodes form the core
+    core_start = int(np.argmax(removal_degrees[order] == degeneracy))
+    in_core = positions >= core_start
+    core_rows = rows[in_core[rows] & in_core[graph.adjacency]]  # one per core edge end
+    core_size = int(in_core.sum())
+    core_edges = len(core_rows) // 2
+    core_max_degree = int(np.bincount(core_rows, minlength=1).max())
+    bounds["degeneracy_core"] = max(
+        _density_bound(core_size, core_edges),
+        _fractional_bound(core_size, core_edges, core_max_degree),
+    )
+    return bounds
+
+
+def optimality_gap(number_of_colors_used, lower_bound):
+    """
+    Returns how much bigger than lower_bound number_of_colors_used is, relative to
+    lower_bound, 0 means the coloring is optimal.
+    """
+    if lower_bound == 0:
+        return 0.0
+    return (number_of_colors_used - lower_bound) / lower_bound
+
+
+def greedy_clique(G, order=None, degeneracy=None):
+    """
+    Returns a maximal clique of CSR graph G (list of nodes), grown greedily in reverse
+    smallest_last order from every node of the densest part of the graph, the biggest
+    of those is returned. order and degeneracy from smallest_last_ordering can be given
+    when they are already computed.
+    """
+    if order is None:
+        order, degeneracy = smallest_last_ordering(G)
+    order = order[::-1]  # nodes of the densest core come first
+    position = {node: i for i, node in enumerate(order)}
+
+    best = []
+    for seed in order[: degeneracy + 1]:
+        candidates = set(G.neighbors(seed))
+        clique = [seed]
+        while candidates:
+            node = min(candidates, key=position.__getitem__)
+            clique.append(node)
+            candidates.intersection_update(G.neighbors(node))
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+
+def _density_bound(n, m):
+    if n == 0:
+        return 0
+    return -(-n * n // (n * n - 2 * m))  # ceil without floats
+
+
+def _fractional_bound(n, m, max_degree):
+    if max_degree == 0:
+        return 1 if n else 0
+    # alpha <= n - m / max_degree, so chromatic number >= n * max_degree / (n * max_degree - m)
+    return -(-n * max_degree // (n * max_degree - m))
@@ -1,5 +1,166 @@
+"""
+Command line interface for coloring algorithms.
+
+python main.py color GRAPH [-a ALGORITHM]    colors one graph and prints result as json
+python main.py serve [-a ALGORITHM]          colors graphs from stdin, one job per line
+
+GRAPH is an edge list file ("u v" lines, or .bin file of uint32 pairs) or a directory
+with graph saved by graph.Graph.save. Jobs of serve mode are paths of such graphs or
+json objects {"path": ..., "algorithm": ..., "id": ...} or {"edges": [[u, v], ...],
+"nodes": n, ...}, results are written to stdout as json lines in order of jobs.
+With --lower-bound (or "lower_bound": true in job) results have lower bound on chromatic
+number and optimality gap, computing the bound often takes longer than coloring.
+planar_coloring does not run the full planarity test (it takes seconds on big meshes),
+graphs with more than 3n - 6 edges or degeneracy above 5 are colored with d_satur and
+other graphs with at most 6 colors, planar or not.
+Modules are imported once, so jobs do not pay interpreter and import startup.
+"""
+
+import argparse
+import json
+import os
+import sys
+from graph import Graph
+from graph_io import load_edge_list
+from planar_coloring import planar_coloring
+from wrapper import wrapper
+from coloring_algorithms import random_sequential, random_sequential_with_interchange
+from coloring_algorithms import largest_first, largest_first_with_interchange
+from coloring_algorithms import smallest_last, smallest_last_with_interchange
+from coloring_algorithms import d_satur, d_satur_with_interchange
+
+ALGORITHMS = {
+    function.__name__: function
+    for function in [
+        random_sequential,
+        random_sequential_with_interchange,
+        largest_first,
+        largest_first_with_interchange,
+        smallest_last,
+        smallest_last_with_interchange,
+        d_satur,
+        d_satur_with_interchange,
+        planar_coloring,
+    ]
+}
+
+
+def load_graph(path):
+    """
+    Returns graph.Graph from directory saved by Graph.save or from edge list file.
+    """
+    if os.path.isdir(path):
+        return Graph.load(path)
+    return load_edge_list(path)
+
+
+def color(G, algorithm, include_coloring=False, lower_bound=False):
+    """
+    Colors G with algorithm (name from ALGORITHMS) through wrapper and returns result as dict.
+    """
+    coloring, number_of_colors_used, time, timing_dict = wrapper(
+        ALGORITHMS[algorithm], G, report=False, trace_every=None, lower_bound=lower_bound
+    )
+    result = {
+        "algorithm": algorithm,
+        "colors": number_of_colors_used,
+        "time": time,
+        "nodes": len(G),
+    }
+    if lower_bound:
+        result["lower_bound"] = timing_dict["lower_bound"]
+        result["gap"] = timing_dict["gap"]
+    if include_coloring:
+        result["coloring"] = [coloring[node] for node in G.nodes()]
+    return result
+
+
+def run_job(line, algorithm, include_coloring=False, lower_bound=False):
+    """
+    Returns result of job given as line of serve mode input.
+    """
+    line = line.strip()
+    job = json.loads(line) if line.startswith("{") else {"path": line}
+    algorithm = job.get("algorithm", algorithm)
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {algorithm}")
+
+    if "edges" in job:
+        G = Graph.from_edge_list(job["edges"], job.get("nodes"))
+    else:
+        G = load_graph(job["path"])
+
+    result = color(
+        G,
+        algorithm,
+        job.get("coloring", include_coloring),
+        job.get("lower_bound", lower_bound),
+    )
+    for key in ("id", "path"):
+        if key in job:
+            result[key] = job[key]
+    return result
+
+
+def serve(
+    algorithm,
+    include_coloring=False,
+    input_file=sys.stdin,
+    output_file=sys.stdout,
+    lower_bound=False,
+):
+    """
+    Runs jobs from input_file until it ends, a job that fails gives result with
+    "error" and does not stop the others.
+    """
+    for line in input_file:
+        if not line.strip():
+            continue
+        try:
+            result = run_job(line, algorithm, include_coloring, lower_bound)
+        except Exception as error:  # one bad job must not stop the whole batch
+            result = {"job": line.strip(), "error": f"{type(error).__name__}: {error}"}
+        output_file.write(json.dumps(result) + "\n")
+        output_file.flush()
+
+
 def main():
-    print("print world")
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    color_parser = subparsers.add_parser("color")
+    color_parser.add_argument("graph")
+    serve_parser = subparsers.add_parser("serve")
+    for subparser in (color_parser, serve_parser):
+        subparser.add_argument(
+            "-a",
+            "--algorithm",
+            choices=sorted(ALGORITHMS),
+            default="d_satur",
+            help="planar_coloring checks planarity only with cheap filters",
+        )
+        subparser.add_argument(
+            "--coloring", action="store_true", help="include colors of nodes in result"
+        )
+        subparser.add_argument(
+            "--lower-bound",
+            action="store_true",
+            help="include lower bound and optimality gap in result (it is slow)",
+        )
+    arguments = parser.parse_args()
+
+    if arguments.command == "color":
+        result = color(
+            load_graph(arguments.graph),
+            arguments.algorithm,
+            arguments.coloring,
+            arguments.lower_bound,
+        )
+        result["path"] = arguments.graph
+        print(json.dumps(result))
+    else:
+        serve(arguments.algorithm, arguments.coloring, lower_bound=arguments.lower_bound)
 
 
 if __name__ == "__main__":
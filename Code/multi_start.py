@@ -0,0 +1,141 @@
+import random
+from collections import Counter
+from multiprocessing import Event, Pool
+from time import time
+import networkx as nx
+import numpy as np
+from coloring_algorithms import random_sequential
+from lower_bounds import lower_bound
+from relabeling import labeled_coloring, relabel
+
+# number of starts given to worker at once
+STARTS_PER_TASK = 16
+
+# state of worker process, set by _init_worker
+_worker = {}
+
+
+def multi_start(
+    G,
+    starts=1000,
+    seed=0,
+    processes=None,
+    target=None,
+    time_limit=None,
+    color_with_interchange=False,
+    trace=None,
+):
+    """
+    Runs random_sequential starts times on a pool of processes, start i shuffles nodes
+    with its own random.Random seeded from stream (seed, i), so results do not depend
+    on number of processes. Returns the best coloring, number of its colors and
+    Counter number of colors: number of starts that used it.
+    All workers stop when the best coloring uses at most target colors (by default
+    lower bound of lower_bounds module, such coloring is optimal) or after
+    time_limit seconds (None means no limit), so fewer than starts starts can be made.
+    trace gets node event after every task of STARTS_PER_TASK starts, its step is
+    the number of starts made before.
+    """
+    if starts < 1:
+        raise ValueError(f"at least one start is needed, got starts={starts}")
+    deadline = None if time_limit is None else time() + time_limit
+    graph, labels = relabel(G)
+    if len(graph) == 0:
+        return {}, 0, Counter()
+    if target is None:
+        target = lower_bound(graph)
+
+    tasks = [
+        range(first, min(first + STARTS_PER_TASK, starts))
+        for first in range(0, starts, STARTS_PER_TASK)
+    ]
+    stop = Event()
+    arguments = (graph, seed, color_with_interchange, deadline, stop)
+    if processes == 1:
+        _init_worker(*arguments)
+        best_colors, upper_bound, distribution = _collect(
+            map(_run_starts, tasks), target, stop, trace
+        )
+    else:
+        with Pool(processes, initializer=_init_worker, initargs=arguments) as pool:
+            best_colors, upper_bound, distribution = _collect(
+                pool.imap_unordered(_run_starts, tasks), target, stop, trace
+            )
+
+    return labeled_coloring(best_colors, labels), upper_bound, distribution
+
+
+def start_rng(seed, start):
+    """
+    Returns random.Random of start from seed stream, independent of other starts.
+    """
+    state = np.random.SeedSequence(seed, spawn_key=(start,)).generate_state(4)
+    return random.Random(int.from_bytes(state.tobytes(), "little"))
+
+
+def _collect(results, target, stop, trace):
+    best_colors, best = None, None  # best is (number of colors, start)
+    distribution = Counter()
+    for colors, result, counts in results:
+        if trace is not None:
+            trace.node(sum(distribution.values()))
+        distribution.update(counts)
+        # ties are broken by start, so the same coloring is returned for any order of tasks
+        if colors is not None and (best is None or result < best):
+            best_colors, best = colors, result
+        if best is not None and best[0] <= target:
+            stop.set()  # tasks not started yet return without coloring
+    return best_colors, best[0], distribution
+
+
+def _init_worker(graph, seed, color_with_interchange, deadline, stop):
+    _worker.update(
+        graph=graph,
+        seed=seed,
+        color_with_interchange=color_with_interchange,
+        deadline=deadline,
+        stop=stop,
+    )
+
+
+def _run_starts(starts):
+    """
+    Returns colors of the best coloring of given starts (list indexed by node),
+    (number of its colors, its start) and list of numbers of colors of all starts made.
+    """
+    graph, deadline, stop = _worker["graph"], _worker["deadline"], _worker["stop"]
+    best, result = None, None
+    counts = []
+    for start in starts:
+        if stop.is_set():
+            break
+        # the first start is always made, so at least one coloring is found
+        if counts and deadline is not None and time() > deadline:
+            stop.set()
+            break
+        coloring, number_of_colors_used = random_sequential(
+            graph,
+            _worker["color_with_interchange"],
+            rng=start_rng(_worker["seed"], start),
+        )
+        counts.append(number_of_colors_used)
+        if result is None or number_of_colors_used < result[0]:
+            best, result = coloring, (number_of_colors_used, start)
+
+    if best is None:
+        return None, None, counts
+    return [best[node] for node in range(len(graph))], result, counts
+
+
+if __name__ == "__main__":
+    G = nx.gnp_random_graph(1000, 0.1, seed=2137)
+    for processes in [1, 2, 4]:
+        start = time()
+        coloring, number_of_colors_used, distribution = multi_start(
+            G, starts=200, processes=processes
+        )
+        elapsed = time() - start
+        print(
+            f"{processes} processes: {sum(distribution.values()) / elapsed:.1f} starts/s, "
+            f"best {number_of_colors_used} colors, distribution {sorted(distribution.items())}"
+        )
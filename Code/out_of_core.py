@@ -0,0 +1,295 @@
+"""
+Greedy coloring of graphs kept on disk (graph.Graph.load with mmap=True).
+
+python out_of_core.py [-n N] [-p P] [--memory-limit MB]    comparison with in-memory coloring
+"""
+
+import argparse
+from array import array
+import os
+import shutil
+import tempfile
+from time import perf_counter
+import numpy as np
+from graph import Graph
+from graph_factory import generate
+from graph_io import _empty_array
+from relabeling import CompactColoring, color_dtype
+import coloring_algorithms
+
+# memory for working arrays, files are read in blocks that fit in it
+MEMORY_LIMIT = 256 * 2**20
+
+# estimated memory taken by one node of a block and one edge of coloring block
+BYTES_PER_NODE = 64
+BYTES_PER_EDGE = 128
+
+
+def out_of_core_largest_first(graph, directory=None, memory_limit=MEMORY_LIMIT):
+    return _color(graph, "largest_first", directory, memory_limit)
+
+
+def out_of_core_smallest_last(graph, directory=None, memory_limit=MEMORY_LIMIT):
+    return _color(graph, "smallest_last", directory, memory_limit)
+
+
+def out_of_core_random_sequential(graph, directory=None, memory_limit=MEMORY_LIMIT, seed=0):
+    return _color(graph, "random_sequential", directory, memory_limit, seed)
+
+
+def _color(graph, strategy, directory, memory_limit, seed=0):
+    """
+    Colors graph (graph.Graph, usually memory-mapped, or directory of graph saved with
+    Graph.save) with greedy algorithm in order of strategy, keeping order, colors and
+    degree buckets in memory-mapped files of a new temporary directory made inside
+    directory (directory of the graph or the system temporary directory by default),
+    which is removed before returning, so calls on the same directory never share
+    files. Nodes are read and colored in blocks, so memory taken by working arrays
+    stays about memory_limit bytes. largest_first and smallest_last color exactly
+    like functions of coloring_algorithms.
+    Returns CompactColoring with memory-mapped colors and number of used colors, like
+    other colorings of graph.Graph it is keyed by nodes 0..n-1 (labels are not used).
+    """
+    if isinstance(graph, str):
+        directory = graph if directory is None else directory
+        graph = Graph.load(graph)
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+    working_directory = tempfile.mkdtemp(prefix=".coloring_", dir=directory)
+    try:
+        return _color_in(graph, strategy, working_directory, memory_limit, seed)
+    finally:
+        # memory-mapped colors stay valid after their file is removed (POSIX),
+        # where removing mapped files is not allowed the directory is left
+        shutil.rmtree(working_directory, ignore_errors=True)
+
+
+def _color_in(graph, strategy, directory, memory_limit, seed):
+    node_budget = max(memory_limit // BYTES_PER_NODE, 1)
+    edge_budget = max(memory_limit // BYTES_PER_EDGE, 1)
+
+    n = len(graph)
+    max_degree = _max_degree(graph, node_budget)
+    order = _empty_array(directory, "order.npy", n, np.int64)
+    if strategy == "largest_first":
+        _degree_order(graph, order, max_degree, node_budget, decreasing=True)
+    elif strategy == "smallest_last":
+        _degree_order(graph, order, max_degree, node_budget, decreasing=False)
+        _smallest_last_order(graph, order, max_degree, directory, memory_limit)
+        order = order[::-1]
+    elif strategy == "random_sequential":
+        _random_order(n, order, node_budget, seed)
+    else:
+        raise ValueError(f"unknown strategy {strategy}")
+
+    # greedy never uses more than max_degree + 1 colors
+    colors = _empty_array(directory, "colors.npy", n, color_dtype(max_degree + 1))
+    for start in range(0, n, node_budget):
+        colors[start : start + node_budget] = 0
+    number_of_colors_used = _color_blocks(graph, order, colors, node_budget, edge_budget)
+    colors.flush()
+    del order
+    os.remove(os.path.join(directory, "order.npy"))
+    return CompactColoring(colors), number_of_colors_used
+
+
+def _degrees(graph, start, stop):
+    return np.diff(np.asarray(graph.offsets[start : stop + 1]))
+
+
+def _max_degree(graph, node_budget):
+    return max(
+        (int(_degrees(graph, start, start + node_budget).max())
+         for start in range(0, len(graph), node_budget)),
+        default=0,
+    )
+
+
+def _degree_order(graph, order, max_degree, node_budget, decreasing):
+    """
+    Writes nodes sorted by degree to order (ties by node, like stable sort)
+    with counting sort over blocks of nodes.
+    """
+
+    def keys(start, stop):
+        degrees = _degrees(graph, start, stop)
+        return max_degree - degrees if decreasing else degrees
+
+    _counting_sort(len(graph), keys, max_degree + 1, order, node_budget)
+
+
+def _random_order(n, order, node_budget, seed):
+    """
+    Writes random permutation of nodes 0..n-1 to order: nodes are sent to random
+    buckets of about half of node_budget nodes and every bucket is shuffled in memory
+    (this is the same as sorting by random keys).
+    """
+    number_of_buckets = -(-2 * n // node_budget)
+
+    def keys(start, stop):  # the same keys for both calls, so generator of every block
+        rng = np.random.default_rng([seed, start])
+        return rng.integers(number_of_buckets, size=stop - start)
+
+    bucket_starts = _counting_sort(n, keys, number_of_buckets, order, node_budget)
+    rng = np.random.default_rng(seed)
+    for start, stop in zip(bucket_starts[:-1], bucket_starts[1:]):
+        order[start:stop] = rng.permutation(np.asarray(order[start:stop]))
+
+
+def _counting_sort(n, keys, number_of_keys, order, node_budget):
+    """
+    Writes nodes 0..n-1 to order sorted by keys (ties by node), keys(start, stop) is
+    array of keys of nodes start..stop-1, called twice for every block.
+    Returns starts of buckets of keys (and n at the end).
+    """
+    counts = np.zeros(number_of_keys, dtype=np.int64)
+    for start in range(0, n, node_budget):
+        counts += np.bincount(keys(start, min(start + node_budget, n)), minlength=number_of_keys)
+    bucket_starts = np.zeros(number_of_keys + 1, dtype=np.int64)
+    np.cumsum(counts, out=bucket_starts[1:])
+    next_free = bucket_starts[:-1].copy()
+
+    for start in range(0, n, node_budget):
+        block_keys = keys(start, min(start + node_budget, n))
+        by_key = np.argsort(block_keys, kind="stable")
+        sorted_keys = block_keys[by_key]
+        # position of every node among nodes of the same key in this block
+        group_starts = np.flatnonzero(np.diff(sorted_keys, prepend=-1))
+        group_sizes = np.diff(group_starts, append=len(sorted_keys))
+        rank = np.arange(len(sorted_keys)) - np.repeat(group_starts, group_sizes)
+        order[next_free[sorted_keys] + rank] = start + by_key
+        next_free[sorted_keys[group_starts]] += group_sizes
+    return bucket_starts
+
+
+def _smallest_last_order(graph, order, max_degree, directory, memory_limit):
+    """
+    Turns order of nodes sorted by degree into smallest last order with Matula-Beck
+    algorithm of coloring_algorithms. Its arrays are in memory when they fit in
+    memory_limit, else in memory-mapped files (they are accessed at random, so it is
+    much slower then).
+    """
+    n = len(graph)
+    if 8 * (4 * n + max_degree + 3) <= memory_limit:
+        degrees = graph.degree()
+        vertices = np.asarray(order)
+        positions = np.empty(n, dtype=np.int64)
+        positions[vertices] = np.arange(n)
+        bucket_starts = np.zeros(max_degree + 1, dtype=np.int64)
+        np.cumsum(np.bincount(degrees, minlength=max_degree + 1)[:-1], out=bucket_starts[1:])
+        arrays = [
+            array("q", a.astype(np.int64).tobytes())
+            for a in (degrees, vertices, positions, bucket_starts, graph.offsets)
+        ]
+        coloring_algorithms._remove_smallest_degree(*arrays, graph.adjacency)
+        order[:] = np.frombuffer(arrays[1], dtype=np.int64)
+        return
+
+    block = max(memory_limit // BYTES_PER_NODE, 1)
+    degrees = _empty_array(directory, "degrees.npy", n, np.int64)
+    positions = _empty_array(directory, "positions.npy", n, np.int64)
+    counts = np.zeros(max_degree + 1, dtype=np.int64)
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        degrees[start:stop] = _degrees(graph, start, stop)
+        counts += np.bincount(degrees[start:stop], minlength=max_degree + 1)
+        positions[np.asarray(order[start:stop])] = np.arange(start, stop)
+    bucket_starts = _empty_array(directory, "buckets.npy", max_degree + 1, np.int64)
+    bucket_starts[0] = 0
+    np.cumsum(counts[:-1], out=bucket_starts[1:])
+    coloring_algorithms._remove_smallest_degree(
+        degrees, order, positions, bucket_starts, graph.offsets, graph.adjacency
+    )
+    del degrees, positions, bucket_starts
+    for name in ["degrees.npy", "positions.npy", "buckets.npy"]:
+        os.remove(os.path.join(directory, name))
+
+
+def _color_blocks(graph, order, colors, node_budget, edge_budget):
+    """
+    Colors nodes greedily in order, in blocks of at most node_budget nodes with
+    at most edge_budget neighbors (or single node), returns number of used colors.
+    Rows of a block are read in order of their place in adjacency, colors of nodes
+    of earlier blocks are read at once and nodes of the block are colored one by one.
+    """
+    offsets, adjacency = graph.offsets, graph.adjacency
+    number_of_colors_used = 0
+    start = 0
+    while start < len(order):
+        nodes = np.asarray(order[start : start + node_budget])
+        starts = np.asarray(offsets[nodes])
+        degrees = np.asarray(offsets[nodes + 1]) - starts
+        size = max(int(np.searchsorted(np.cumsum(degrees), edge_budget, side="right")), 1)
+        nodes, starts, degrees = nodes[:size], starts[:size], degrees[:size]
+        start += size
+
+        by_place = np.argsort(starts)
+        place_degrees = degrees[by_place]
+        buffer_starts = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(place_degrees, out=buffer_starts[1:])
+        positions = np.repeat(starts[by_place] - buffer_starts[:-1], place_degrees)
+        neighbors = np.asarray(adjacency[positions + np.arange(len(positions))])
+        row_starts = np.empty(size, dtype=np.int64)  # where neighbors of node begin
+        row_starts[by_place] = buffer_starts[:-1]
+        neighbor_colors = np.asarray(colors[neighbors])  # 0 for nodes of this block
+
+        # neighbors from this block, grouped by node, with their index in block
+        by_node = np.argsort(nodes)
+        index = np.minimum(np.searchsorted(nodes, neighbors, sorter=by_node), size - 1)
+        inside = np.flatnonzero(nodes[by_node[index]] == neighbors)
+        inside_owners = np.repeat(by_place, place_degrees)[inside]
+        grouped = np.argsort(inside_owners, kind="stable")
+        inside_nodes = by_node[index[inside[grouped]]].tolist()
+        inside_bounds = np.searchsorted(inside_owners[grouped], np.arange(size + 1)).tolist()
+
+        block_colors = [0] * size
+        neighbor_colors = neighbor_colors.tolist()
+        row_starts, row_ends = row_starts.tolist(), (row_starts + degrees).tolist()
+        for i in range(size):
+            taken = set(neighbor_colors[row_starts[i] : row_ends[i]])
+            for j in inside_nodes[inside_bounds[i] : inside_bounds[i + 1]]:
+                taken.add(block_colors[j])
+            color = 1
+            while color in taken:
+                color += 1
+            block_colors[i] = color
+        colors[nodes] = block_colors
+        number_of_colors_used = max(number_of_colors_used, max(block_colors))
+    return number_of_colors_used
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=200000)
+    parser.add_argument("-p", type=float, default=None, help="default 20 / n")
+    parser.add_argument("--memory-limit", type=float, default=16, help="in MB")
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        generate("gnp", arguments.n, p=arguments.p or 20 / arguments.n, seed=2137).save(
+            directory
+        )
+        G = Graph.load(directory)
+        edges = G.edges()
+        memory_limit = int(arguments.memory_limit * 2**20)
+        for name, function in [
+            ("largest_first", out_of_core_largest_first),
+            ("smallest_last", out_of_core_smallest_last),
+            ("random_sequential", out_of_core_random_sequential),
+        ]:
+            start = perf_counter()
+            coloring, number_of_colors_used = function(G, directory, memory_limit)
+            elapsed = perf_counter() - start
+            in_memory = getattr(coloring_algorithms, name)
+            start = perf_counter()
+            _, in_memory_colors = in_memory(Graph.load(directory, mmap=False))
+            in_memory_elapsed = perf_counter() - start
+            for edge in edges:
+                assert (
+                    coloring[edge[0]] != coloring[edge[1]]
+                ), f"{name} created invalid coloring, two adjacent nodes have the same color"
+            print(
+                f"{name}: out of core {elapsed:.2f}s {number_of_colors_used} colors, "
+                f"in memory {in_memory_elapsed:.2f}s {in_memory_colors} colors"
+            )
+            del coloring
@@ -0,0 +1,175 @@
+import networkx as nx
+from coloring_algorithms import d_satur, smallest_last, smallest_last_ordering, _greedy
+from coloring_algorithms import _coloring_of_labels
+from relabeling import labeled_coloring, relabel
+
+# degree up to which neighbors of degree 5 node are preferred for contraction, every
+# planar graph without nodes of degree <= 4 has a node of degree 5 with at least four
+# such neighbors (Matula, Shiloach and Tarjan), so contraction costs O(1)
+SMALL_DEGREE = 11
+
+
+def planar_coloring(G, trace=None, five_colors=False, planar=None):
+    """
+    Colors planar graph G (networkx or graph.Graph) with at most 6 colors, or 5 colors
+    with five_colors, in linear time. Like functions of coloring_algorithms, coloring
+    of graph.Graph is keyed by nodes 0..n-1 (not by its labels).
+    Full planarity test (networkx check_planarity) is slow, 13.7s on 80k node mesh, so
+    by default only cheap filters are used: graphs with more than 3n - 6 edges or with
+    degeneracy above 5 are not planar and are colored with d_satur. Other graphs
+    that are not planar are still colored properly with at most 6 (5) colors, or with
+    d_satur when five_coloring finds no reduction. planar="check" runs the full test
+    first, planar=True skips all checks (for graphs known to be planar, e.g. meshes)
+    and planar=False colors G with d_satur.
+    6 colors: planar graph has a node of degree <= 5, so its degeneracy is at most 5
+    and smallest_last uses at most degeneracy + 1 colors.
+    5 colors: see five_coloring.
+    """
+    graph, labels = relabel(G)
+    if planar == "check":
+        planar = is_planar(graph)
+    if planar is None:
+        return _filtered_coloring(G, graph, labels, trace, five_colors)
+    if not planar:
+        return d_satur(G, trace=trace)
+    if not five_colors:
+        return smallest_last(G, trace=trace)
+
+    colors = five_coloring(graph, trace)
+    return labeled_coloring(colors, labels), max(colors, default=0)
+
+
+def _filtered_coloring(G, graph, labels, trace, five_colors):
+    # planar_coloring of graph with planarity checked only by cheap filters
+    if too_many_edges(graph):
+        return d_satur(G, trace=trace)
+    # the same order as smallest_last, so it is computed only once
+    order, degeneracy = smallest_last_ordering(graph)
+    if degeneracy > 5:
+        return d_satur(G, trace=trace)
+
+    if not five_colors:
+        # planar graphs are sparse, so _greedy gives dict of nodes 0..n-1
+        coloring, number_of_colors_used = _greedy(graph, order[::-1], trace=trace)
+        return _coloring_of_labels(coloring, labels), number_of_colors_used
+
+    try:
+        colors = five_coloring(graph, trace)
+    except ValueError:  # no reduction, G is not planar
+        return d_satur(G, trace=trace)
+    return labeled_coloring(colors, labels), max(colors, default=0)
+
+
+def too_many_edges(G):
+    # planar graph with n >= 3 nodes has at most 3n - 6 edges
+    n = len(G)
+    return n >= 3 and G.number_of_edges() > 3 * n - 6
+
+
+def is_planar(G):
+    """
+    Returns True if CSR graph G is planar, graphs with more than 3n - 6 edges are
+    rejected without running networkx planarity test.
+    """
+    n = len(G)
+    if too_many_edges(G):
+        return False
+    graph = nx.Graph()
+    graph.add_nodes_from(range(n))
+    graph.add_edges_from(G.edges())
+    return nx.check_planarity(graph)[0]
+
+
+def five_coloring(G, trace=None):
+    """
+    Returns list of colors (1..5) of nodes of planar CSR graph G. Nodes are removed one
+    by one, node of degree <= 4 is removed as it is, otherwise node v of degree 5 is
+    removed and its two non adjacent neighbors x, y are contracted into x. Then nodes
+    are colored in reverse, y gets color of x and v has at most 4 different colors
+    around it. Every reduction keeps the coloring proper in any graph, but only planar
+    graphs are sure to have one, ValueError is raised when no reduction exists.
+    """
+    n = len(G)
+    adjacency = [set(G.neighbors(node)) for node in range(n)]
+    low = [node for node in range(n) if len(adjacency[node]) <= 4]  # may be outdated
+    five = {node for node in range(n) if len(adjacency[node]) == 5}
+    removed = [False] * n
+    # (v, neighbors of v when removed, (x, y) or None), in order of removal
+    reductions = []
+
+    def update(nodes):
+        for node in nodes:
+            degree = len(adjacency[node])
+            if degree <= 4:
+                low.append(node)
+                five.discard(node)
+            elif degree == 5:
+                five.add(node)
+            else:
+                five.discard(node)
+
+    remaining = n
+    while remaining:
+        while low and removed[low[-1]]:
+            low.pop()
+        if low:
+            node, pair = low.pop(), None
+        else:
+            node, pair = _contractible(adjacency, five)
+            x, y = pair
+            # y is merged into x, it has degree at most SMALL_DEGREE in planar graphs
+            for neighbor in adjacency[y]:
+                adjacency[neighbor].discard(y)
+                if neighbor != x:
+                    adjacency[neighbor].add(x)
+                    adjacency[x].add(neighbor)
+            removed[y] = True
+            remaining -= 1
+            five.discard(y)
+            update(adjacency[y] | {x})
+            adjacency[y] = set()
+
+        neighbors = list(adjacency[node])
+        reductions.append((node, neighbors, pair))
+        for neighbor in neighbors:
+            adjacency[neighbor].discard(node)
+        removed[node] = True
+        remaining -= 1
+        five.discard(node)
+        update(neighbors)
+
+    colors = [0] * n
+    for step, (node, neighbors, pair) in enumerate(reversed(reductions)):
+        if trace is not None:
+            trace.node(step)
+        if pair is not None:
+            x, y = pair
+            colors[y] = colors[x]
+        neighbor_colors = {colors[neighbor] for neighbor in neighbors}
+        colors[node] = min(color for color in range(1, 6) if color not in neighbor_colors)
+    return colors
+
+
+def _contractible(adjacency, five):
+    """
+    Returns node of degree 5 and its two non adjacent neighbors, with neighbors
+    of small degree preferred.
+    """
+    fallback = None
+    for node in five:
+        neighbors = sorted(adjacency[node], key=lambda neighbor: len(adjacency[neighbor]))
+        for i, x in enumerate(neighbors):
+            for y in neighbors[i + 1 :]:
+                if y not in adjacency[x]:
+                    if len(adjacency[y]) <= SMALL_DEGREE:
+                        return node, _merge_order(adjacency, x, y)
+                    if fallback is None:
+                        fallback = node, _merge_order(adjacency, x, y)
+    if fallback is None:
+        raise ValueError("graph is not planar, it can not be reduced")
+    return fallback
+
+
+def _merge_order(adjacency, x, y):
+    # node with fewer neighbors is merged into the other one
+    return (x, y) if len(adjacency[x]) >= len(adjacency[y]) else (y, x)
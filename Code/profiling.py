@@ -0,0 +1,227 @@
+"""
+Profiling of coloring algorithms split into phases.
+
+python profiling.py ALGORITHM [-n N] [-p P] [--collapsed PATH] [--repeats K]
+"""
+
+import argparse
+import cProfile
+import pstats
+import random
+import sys
+import tracemalloc
+from time import perf_counter, process_time
+import coloring_algorithms
+from graph_factory import generate
+
+# ordering - everything before the first node is colored (sort, shuffle, degeneracy
+# ordering, building queues), coloring - choosing colors of nodes (for d_satur also
+# choosing the next node), interchange - attempts of interchange
+PHASES = ("ordering", "coloring", "interchange")
+
+
+class PhaseProfile:
+    """
+    Event sink passed to coloring algorithms as trace argument (like tracing.Trace),
+    that adds wall and CPU time spent between events to the current phase.
+    With memory=True (tracemalloc must be running) peak of traced memory and net number
+    of allocated blocks of every phase are recorded too.
+    """
+
+    __slots__ = [
+        "memory",
+        "phase",
+        "wall",
+        "cpu",
+        "peak_memory",
+        "blocks",
+        "events",
+        "_last",
+    ]
+
+    def __init__(self, memory=False) -> None:
+        self.memory = memory
+        self.phase = "ordering"
+        self.wall = dict.fromkeys(PHASES, 0.0)
+        self.cpu = dict.fromkeys(PHASES, 0.0)
+        self.peak_memory = dict.fromkeys(PHASES, 0)
+        self.blocks = dict.fromkeys(PHASES, 0)
+        self.events = 0
+        self._last = None
+
+    def start(self):
+        if self.memory:
+            tracemalloc.reset_peak()
+        self._last = (perf_counter(), process_time(), sys.getallocatedblocks())
+
+    def stop(self):
+        self._switch(self.phase)
+
+    def node(self, step):
+        self.events += 1
+        if self.phase == "ordering":
+            self._switch("coloring")
+
+    def interchange_start(self, step):
+        self.events += 1
+        self._switch("interchange")
+
+    def interchange_end(self, step, succeeded):
+        self.events += 1
+        self._switch("coloring")
+
+    def _switch(self, phase):
+        wall, cpu, blocks = perf_counter(), process_time(), sys.getallocatedblocks()
+        last_wall, last_cpu, last_blocks = self._last
+        self.wall[self.phase] += wall - last_wall
+        self.cpu[self.phase] += cpu - last_cpu
+        self.blocks[self.phase] += blocks - last_blocks
+        if self.memory:
+            _, peak = tracemalloc.get_traced_memory()
+            self.peak_memory[self.phase] = max(self.peak_memory[self.phase], peak)
+            tracemalloc.reset_peak()
+        self.phase = phase
+        self._last = (perf_counter(), process_time(), sys.getallocatedblocks())
+
+    def results(self):
+        return {
+            phase: {
+                "wall": self.wall[phase],
+                "cpu": self.cpu[phase],
+                "peak_memory": self.peak_memory[phase],
+                "allocated_blocks": self.blocks[phase],
+            }
+            for phase in PHASES
+        }
+
+
+def profile(coloring_func, G, memory=True, collapsed_path=None, seed=0, repeats=5):
+    """
+    Returns dict with time and memory of every phase of coloring_func(G) (see PHASES),
+    total wall time with and without profiling and overhead of profiling.
+    After a warm-up run both times are the best of repeats runs (a single cold run
+    can be slower than the profiled one), phases come from the fastest profiled run.
+    Memory is measured in a separate run, because tracemalloc slows everything down,
+    so times of phases come from run with small overhead.
+    Every run starts with random seeded with seed, so all of them do the same work.
+    With collapsed_path cProfile data of another run is written there as collapsed
+    stacks ("f;g;h microseconds" lines) for flamegraph tools.
+    """
+    random.seed(seed)
+    coloring_func(G)  # warm-up, caches and lazily built structures are ready after it
+    plain_time = float("inf")
+    for _ in range(repeats):
+        random.seed(seed)
+        start = perf_counter()
+        coloring_func(G)
+        plain_time = min(plain_time, perf_counter() - start)
+
+    phases, profiled_time, number_of_colors_used = min(
+        (_profiled_run(coloring_func, G, seed) for _ in range(repeats)),
+        key=lambda run: run[1],
+    )
+    report = {
+        "algorithm": coloring_func.__name__,
+        "nodes": len(G),
+        "colors": number_of_colors_used,
+        "phases": phases.results(),
+        "events": phases.events,
+        "time": plain_time,
+        "profiled_time": profiled_time,
+        "overhead": profiled_time / plain_time - 1 if plain_time else 0.0,
+    }
+
+    if memory:
+        tracemalloc.start()
+        memory_phases, memory_time, _ = _profiled_run(coloring_func, G, seed, memory=True)
+        tracemalloc.stop()
+        for phase, result in memory_phases.results().items():
+            report["phases"][phase]["peak_memory"] = result["peak_memory"]
+            report["phases"][phase]["allocated_blocks"] = result["allocated_blocks"]
+        report["memory_overhead"] = memory_time / plain_time - 1 if plain_time else 0.0
+
+    if collapsed_path is not None:
+        profiler = cProfile.Profile()
+        random.seed(seed)
+        profiler.runcall(coloring_func, G)
+        with open(collapsed_path, "w") as file:
+            for stack, microseconds in collapsed_stacks(profiler):
+                file.write(f"{stack} {microseconds}\n")
+    return report
+
+
+def _profiled_run(coloring_func, G, seed, memory=False):
+    phases = PhaseProfile(memory)
+    random.seed(seed)
+    start = perf_counter()
+    phases.start()
+    _, number_of_colors_used = coloring_func(G, trace=phases)
+    phases.stop()
+    return phases, perf_counter() - start, number_of_colors_used
+
+
+def collapsed_stacks(profiler, max_depth=64):
+    """
+    Returns list of (stack, microseconds) of cProfile.Profile, stack is ";" separated
+    names of functions. cProfile keeps only caller -> callee times, so time of
+    a function is split between its callees in proportion of their cumulative times.
+    """
+    stats = pstats.Stats(profiler).stats
+    callees = {function: [] for function in stats}
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            if caller in callees:
+                callees[caller].append((function, cumulative))
+
+    stacks = []
+
+    def expand(function, path, time):
+        _, _, total, cumulative, _ = stats[function]
+        path = path + [_name(function)]
+        share = time / cumulative if cumulative else 0.0
+        if total * share >= 1e-6:
+            stacks.append((";".join(path), round(total * share * 1e6)))
+        if len(path) >= max_depth:
+            return
+        for callee, callee_time in callees[function]:
+            if _name(callee) not in path:  # recursion is cut
+                expand(callee, path, callee_time * share)
+
+    for function, (_, _, _, cumulative, callers) in stats.items():
+        if not callers:
+            expand(function, [], cumulative)
+    return stacks
+
+
+def _name(function):
+    filename, line, name = function
+    if filename == "~":  # built-in function
+        return name
+    return f"{filename.rsplit('/', 1)[-1]}:{line}:{name}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("algorithm")
+    parser.add_argument("-n", type=int, default=2000)
+    parser.add_argument("-p", type=float, default=0.1)
+    parser.add_argument("--collapsed", default=None)
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs, the best is kept")
+    arguments = parser.parse_args()
+
+    G = generate("gnp", arguments.n, p=arguments.p)
+    function = getattr(coloring_algorithms, arguments.algorithm)
+    report = profile(
+        function, G, collapsed_path=arguments.collapsed, repeats=arguments.repeats
+    )
+    print(
+        f"{report['algorithm']}: {report['colors']} colors, {report['time']:.3f}s, "
+        f"profiled {report['profiled_time']:.3f}s (overhead {report['overhead']:.1%}, "
+        f"with tracemalloc {report['memory_overhead']:.1%})"
+    )
+    for phase, result in report["phases"].items():
+        print(
+            f"{phase:>12} wall {result['wall']:8.4f}s cpu {result['cpu']:8.4f}s "
+            f"peak {result['peak_memory'] / 2**20:8.2f}MB "
+            f"blocks {result['allocated_blocks']:>8}"
+        )
@@ -0,0 +1,93 @@
+from collections.abc import Mapping
+import numpy as np
+from graph import Graph
+
+
+def relabel(G):
+    """
+    Returns graph.Graph with nodes 0..n-1 and list of original nodes (node i of the
+    graph is labels[i]), labels are None when nodes of G already are 0..n-1.
+    Graph.Graph is returned as it is, with labels None (its nodes are 0..n-1 for
+    coloring functions, whatever labels it keeps).
+    """
+    if isinstance(G, Graph):
+        return G, None
+    graph = Graph.from_networkx(G)
+    return graph, graph.labels
+
+
+def labeled_coloring(colors, labels):
+    """
+    Returns dict of colors keyed by original nodes, colors[i] is color of node i and
+    labels are the ones returned by relabel (None when nodes are 0..n-1).
+    """
+    if isinstance(colors, np.ndarray):
+        colors = colors.tolist()
+    return dict(zip(range(len(colors)) if labels is None else labels, colors))
+
+
+def compact_coloring(coloring_func, G, **kwargs):
+    """
+    Colors G with coloring_func run on nodes 0..n-1 and returns CompactColoring and
+    number of used colors. Relabeling is done once, so the same CSR graph can be
+    passed to many functions. Array paths of coloring functions hand back
+    CompactColoring, its colors are kept without building dict of all nodes.
+    """
+    graph, labels = relabel(G)
+    coloring, number_of_colors_used = coloring_func(graph, **kwargs)
+    if isinstance(coloring, CompactColoring):
+        return CompactColoring(coloring.colors, labels), number_of_colors_used
+    colors = np.fromiter(
+        (coloring[node] for node in range(len(graph))),
+        dtype=color_dtype(number_of_colors_used),
+        count=len(graph),
+    )
+    return CompactColoring(colors, labels), number_of_colors_used
+
+
+def color_dtype(number_of_colors):
+    """
+    Returns the smallest unsigned dtype that holds colors 0..number_of_colors.
+    """
+    if number_of_colors < 2**8:
+        return np.uint8
+    if number_of_colors < 2**16:
+        return np.uint16
+    return np.uint32
+
+
+class CompactColoring(Mapping):
+    """
+    Read only dict view of coloring kept as array of colors (colors[i] is color of
+    node i, 1 or 2 bytes per node instead of about 100 of dict) and list of original
+    nodes (None when nodes are 0..n-1). Index of original nodes is built on first lookup.
+    """
+
+    __slots__ = ["colors", "labels", "_index"]
+
+    def __init__(self, colors, labels=None) -> None:
+        self.colors = colors
+        self.labels = labels
+        self._index = None
+
+    def __getitem__(self, node):
+        if self.labels is None:
+            if not (isinstance(node, (int, np.integer)) and 0 <= node < len(self.colors)):
+                raise KeyError(node)
+            return int(self.colors[node])
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(self.labels)}
+        return int(self.colors[self._index[node]])
+
+    def __iter__(self):
+        return iter(range(len(self.colors)) if self.labels is None else self.labels)
+
+    def __len__(self):
+        return len(self.colors)
+
+    def to_dict(self):
+        return dict(zip(self, self.colors.tolist()))
+
+    def nbytes(self):
+        # memory of colors, labels are shared with the graph
+        return self.colors.nbytes
@@ -1,15 +1,16 @@
+import random
 from matplotlib import pyplot as plt
-import networkx as nx
-from coloring_algorithms_with_timer import (
-    random_sequential,
-    random_sequential_with_interchange,
-)
-from coloring_algorithms_with_timer import largest_first, largest_first_with_interchange
-from coloring_algorithms_with_timer import smallest_last, smallest_last_with_interchange
-from coloring_algorithms_with_timer import d_satur, d_satur_with_interchange
+from graph_factory import generate
+from coloring_algorithms import random_sequential, random_sequential_with_interchange
+from coloring_algorithms import largest_first, largest_first_with_interchange
+from coloring_algorithms import smallest_last, smallest_last_with_interchange
+from coloring_algorithms import d_satur, d_satur_with_interchange
 from wrapper import wrapper
 
-G = nx.erdos_renyi_graph(100, 0.5)
+# a new random graph on every run
+G = generate(
+    "gnp", 100, p=0.5, seed=random.randrange(2**32), cache_directory=None
+).to_networkx()
 
 # nx.draw(G, with_labels=True)
 # plt.show()
@@ -27,11 +28,8 @@ function_list = [
 
 for function in function_list:
     coloring, number, time, coloring_dict = wrapper(function, G)
-    plt.plot(
-        [i[1] for i in coloring_dict["coloring"]],
-        [i[0] for i in coloring_dict["coloring"]],
-        label=function.__name__,
-    )
+    steps, times = coloring_dict["coloring"].events()
+    plt.plot(times, steps, label=function.__name__)
 
 plt.legend()
 plt.show()
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import networkx as nx
+from graph import Graph
+from coloring_cache import ColoringCache, fingerprint
+from coloring_algorithms import largest_first, d_satur, random_sequential
+from wrapper import wrapper
+
+
+def check(G, coloring, name):
+    assert set(coloring) == set(G), f"{name} returned coloring of other nodes"
+    for edge in G.edges():
+        assert (
+            coloring[edge[0]] != coloring[edge[1]]
+        ), f"{name} returned invalid coloring, two adjacent nodes have the same color"
+
+
+G = nx.gnp_random_graph(200, 0.1, seed=2137)
+
+# fingerprint depends on structure, order of neighbors and names of nodes only
+assert fingerprint(G) == fingerprint(nx.gnp_random_graph(200, 0.1, seed=2137))
+assert fingerprint(G) == fingerprint(Graph.from_networkx(G))
+assert fingerprint(G) != fingerprint(nx.gnp_random_graph(200, 0.1, seed=2138))
+assert fingerprint(nx.path_graph(3)) != fingerprint(nx.Graph([(0, 2), (2, 1)]))
+H = nx.Graph()
+H.add_nodes_from([0, 1, 2])
+H.add_edges_from([(0, 2), (0, 1)])  # neighbors of 0 in other order than in star_graph
+assert fingerprint(H) != fingerprint(nx.star_graph(2))
+assert fingerprint(nx.relabel_nodes(G, str)) != fingerprint(G)
+
+# misses, hits and results equal to results without cache
+cache = ColoringCache()
+for coloring_func in [largest_first, d_satur]:
+    expected = coloring_func(G)
+    for _ in range(3):
+        coloring, number_of_colors_used = cache.color(coloring_func, G)
+        check(G, coloring, coloring_func.__name__)
+        assert dict(coloring) == expected[0] and number_of_colors_used == expected[1]
+coloring, _ = cache.color(largest_first, G, color_with_interchange=True)
+check(G, coloring, "largest_first with interchange")
+stats = cache.stats()
+assert (stats["misses"], stats["hits"], stats["bypasses"]) == (3, 4, 0), stats
+
+# graph.Graph of the same graph is a hit, colored by nodes 0..n-1
+coloring, _ = cache.color(largest_first, Graph.from_networkx(G))
+assert cache.stats()["hits"] == 5
+
+# nodes of G are the keys of cached coloring, whatever they are
+L = nx.relabel_nodes(G, lambda node: f"node {node}")
+coloring, _ = cache.color(largest_first, L)
+check(L, coloring, "largest_first of graph with names of nodes")
+graph = Graph.from_networkx(L)
+coloring, _ = cache.color(largest_first, graph)
+check(graph, coloring, "largest_first of graph.Graph with labels")
+assert cache.stats()["misses"] == 4
+
+# randomized functions are cached only with seed, the same seed gives the same coloring
+first, _ = cache.color(random_sequential, G, seed=1)
+second, _ = cache.color(random_sequential, G, seed=1)
+other, _ = cache.color(random_sequential, G, seed=2)
+assert dict(first) == dict(second) and dict(first) != dict(other)
+for _ in range(3):
+    coloring, _ = cache.color(random_sequential, G)
+    check(G, coloring, "random_sequential without seed")
+stats = cache.stats()
+assert (stats["misses"], stats["bypasses"]) == (6, 3), stats
+
+# functions without interchange are rejected instead of silently ignoring it
+try:
+    cache.color(lambda G: largest_first(G), G, color_with_interchange=True)
+except ValueError:
+    pass
+else:
+    raise AssertionError("color_with_interchange accepted for function without it")
+
+# the least recently used entries are evicted from memory
+cache = ColoringCache(max_entries=2)
+graphs = [nx.gnp_random_graph(50, 0.2, seed=seed) for seed in range(3)]
+for graph in graphs:
+    cache.color(largest_first, graph)
+cache.color(largest_first, graphs[2])  # hit, graphs[0] was evicted, not graphs[2]
+cache.color(largest_first, graphs[0])
+stats = cache.stats()
+assert (stats["hits"], stats["misses"]) == (1, 4), stats
+assert stats["memory_evictions"] == 2 and stats["memory_entries"] == 2, stats
+
+# results are kept on disk for other caches, disk is limited to max_disk_bytes
+with tempfile.TemporaryDirectory() as directory:
+    ColoringCache(directory=directory).color(largest_first, L)
+    cache = ColoringCache(directory=directory)
+    coloring, _ = cache.color(largest_first, L)
+    check(L, coloring, "largest_first from disk")
+    assert cache.stats()["disk_hits"] == 1
+
+    size = os.path.getsize(os.path.join(directory, os.listdir(directory)[0]))
+    cache = ColoringCache(max_entries=1, directory=directory, max_disk_bytes=3 * size)
+    for seed in range(6):
+        graph = nx.relabel_nodes(nx.gnp_random_graph(200, 0.1, seed=seed), str)
+        cache.color(largest_first, graph)
+    files = [name for name in os.listdir(directory) if name.endswith(".pkl")]
+    assert sum(os.path.getsize(os.path.join(directory, name)) for name in files) <= 3 * size
+    assert cache.stats()["disk_evictions"] >= 3, cache.stats()
+
+# wrapper takes results from cache
+cache = ColoringCache()
+for _ in range(2):
+    coloring, number_of_colors_used, _, timing_dict = wrapper(
+        largest_first, L, report=False, cache=cache
+    )
+    check(L, coloring, "wrapper with cache")
+    assert timing_dict["coloring"] is None  # runs with cache are not traced
+assert cache.stats()["hits"] == 1
@@ -0,0 +1,99 @@
+import random
+from time import perf_counter
+import networkx as nx
+import matplotlib.pyplot as plt
+from coloring_algorithms import d_satur, d_satur_with_interchange, color_node
+
+
+def d_satur_quadratic(G, color_with_interchange=False):
+    # previous implementation of d_satur, rescans all uncolored nodes on every step
+    n = len(G)
+    satur = {i: 0 for i in range(n)}
+    node_colors = {}
+    max_color = 1
+    for i in range(n):
+        max_satur = max(satur.values())
+        nodes = [node for node, saturation in satur.items() if saturation == max_satur]
+        degrees = {node: G.degree(node) for node in nodes}
+        node = max(degrees, key=degrees.get)
+        node_colors, max_color = color_node(
+            G, node, node_colors, max_color, color_with_interchange
+        )
+        del satur[node]
+        for neighbor in G.neighbors(node):
+            if neighbor in satur:
+                satur[neighbor] += 1
+
+    return node_colors, max_color
+
+
+# test bucket queue against previous implementation
+number_of_repetitions = 3
+graph_sizes = list(range(500, 5001, 500))
+times_quadratic = []
+times_bucket_queue = []
+for n in graph_sizes:
+    list_of_graphs = [
+        nx.gnp_random_graph(n, 10 / n, seed=seed)
+        for seed in range(number_of_repetitions)
+    ]
+
+    # both implementations have to return exactly the same colorings
+    for G in list_of_graphs:
+        assert d_satur(G) == d_satur_quadratic(G)
+        assert d_satur_with_interchange(G) == d_satur_quadratic(G, True)
+
+    start = perf_counter()
+    for G in list_of_graphs:
+        d_satur_quadratic(G)
+    stop = perf_counter()
+    times_quadratic.append(stop - start)
+
+    start = perf_counter()
+    for G in list_of_graphs:
+        d_satur(G)
+    stop = perf_counter()
+    times_bucket_queue.append(stop - start)
+
+    print(
+        f"n: {n}, quadratic: {times_quadratic[-1]:.3f}s, "
+        f"bucket queue: {times_bucket_queue[-1]:.3f}s, "
+        f"speedup: {times_quadratic[-1] / times_bucket_queue[-1]:.1f}x"
+    )
+
+# dense graphs, every colored node changes saturation of most of the others
+for n, p in [(500, 0.5), (1000, 0.5), (1000, 0.9), (2000, 0.5)]:
+    G = nx.gnp_random_graph(n, p, seed=2137)
+    start = perf_counter()
+    coloring_quadratic = d_satur_quadratic(G)
+    time_quadratic = perf_counter() - start
+    start = perf_counter()
+    coloring_bucket_queue = d_satur(G)
+    time_bucket_queue = perf_counter() - start
+    assert coloring_bucket_queue == coloring_quadratic
+    assert d_satur_with_interchange(G) == d_satur_quadratic(G, True)
+    print(
+        f"n: {n}, p: {p}, quadratic: {time_quadratic:.3f}s, "
+        f"bucket queue: {time_bucket_queue:.3f}s, "
+        f"speedup: {time_quadratic / time_bucket_queue:.1f}x"
+    )
+
+# nodes 0..n-1 inserted in random order, ties are still broken by smaller node
+for seed in range(number_of_repetitions):
+    G = nx.gnp_random_graph(300, 0.05, seed=seed)
+    nodes = list(G)
+    random.Random(seed).shuffle(nodes)
+    H = nx.Graph()
+    H.add_nodes_from(nodes)
+    H.add_edges_from(G.edges())
+    assert d_satur(H) == d_satur_quadratic(H)
+    assert d_satur_with_interchange(H) == d_satur_quadratic(H, True)
+
+# plotting results
+plt.plot(graph_sizes, times_quadratic, label="quadratic")
+plt.plot(graph_sizes, times_bucket_queue, label="bucket queue")
+plt.xlabel("number of nodes")
+plt.ylabel("time taken to color")
+plt.title("d_satur time vs number of nodes")
+plt.legend()
+plt.show()
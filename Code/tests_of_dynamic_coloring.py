@@ -0,0 +1,56 @@
+import random
+import networkx as nx
+from dynamic_coloring import DynamicColoring
+
+
+def check(dynamic_coloring, operation):
+    G, node_colors = dynamic_coloring.G, dynamic_coloring.node_colors
+    assert set(node_colors) == set(G), f"{operation} left nodes without color"
+    for edge in G.edges():
+        assert (
+            node_colors[edge[0]] != node_colors[edge[1]]
+        ), f"{operation} created invalid coloring, two adjacent nodes have the same color"
+    assert dynamic_coloring.max_color == max(
+        node_colors.values(), default=0
+    ), f"{operation} left wrong max_color"
+
+
+# random updates, after every one coloring has to be proper and max_color exact
+rng = random.Random(2137)
+for color_with_interchange in [False, True]:
+    for p in [0.05, 0.3]:
+        G = nx.gnp_random_graph(100, p, seed=2137)
+        dynamic_coloring = DynamicColoring(G, color_with_interchange=color_with_interchange)
+        check(dynamic_coloring, "initial coloring")
+        next_node = len(G)
+        for _ in range(2000):
+            nodes = list(G)
+            operation = rng.choice(["add_node", "remove_node", "add_edge", "remove_edge"])
+            if operation == "add_node":
+                # some neighbors are new nodes too
+                neighbors = rng.sample(nodes, min(len(nodes), rng.randrange(10)))
+                neighbors += range(next_node + 1, next_node + 1 + rng.randrange(3))
+                dynamic_coloring.add_node(next_node, neighbors)
+                next_node = max(G) + 1
+            elif operation == "remove_node" and nodes:
+                dynamic_coloring.remove_node(rng.choice(nodes))
+            elif operation == "add_edge":
+                u = rng.choice(nodes) if nodes else next_node
+                v = rng.choice(nodes + [next_node])
+                if u != v:
+                    dynamic_coloring.add_edge(u, v)
+                    next_node = max(G) + 1
+            elif operation == "remove_edge" and G.number_of_edges():
+                dynamic_coloring.remove_edge(*rng.choice(list(G.edges())))
+            check(dynamic_coloring, operation)
+
+# self loops can not be colored, they are rejected and the coloring stays proper
+dynamic_coloring = DynamicColoring(nx.gnp_random_graph(20, 0.3, seed=2137))
+for operation, arguments in [("add_edge", (3, 3)), ("add_node", (20, [1, 20]))]:
+    try:
+        getattr(dynamic_coloring, operation)(*arguments)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(f"{operation} accepted self loop")
+    check(dynamic_coloring, operation)
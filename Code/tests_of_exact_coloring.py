@@ -0,0 +1,103 @@
+import networkx as nx
+from graph import Graph
+from exact_coloring import exact_coloring
+from wrapper import wrapper
+
+
+def colorable(G, k):
+    # plain backtracking over nodes in order, every node tries every color 1..k
+    nodes = list(G)
+    colors = {}
+
+    def extend(i):
+        if i == len(nodes):
+            return True
+        node = nodes[i]
+        taken = {colors.get(neighbor) for neighbor in G.neighbors(node)}
+        for color in range(1, k + 1):
+            if color not in taken:
+                colors[node] = color
+                if extend(i + 1):
+                    return True
+                del colors[node]
+        return False
+
+    return extend(0)
+
+
+def chromatic_number(G):
+    k = 0
+    while not colorable(G, k):
+        k += 1
+    return k
+
+
+def check(G, coloring, number_of_colors_used, lower_bound, name):
+    assert set(coloring) == set(G), f"{name} left nodes without color"
+    for edge in G.edges():
+        assert (
+            coloring[edge[0]] != coloring[edge[1]]
+        ), f"{name} created invalid coloring, two adjacent nodes have the same color"
+    assert number_of_colors_used == max(coloring.values(), default=0)
+    assert lower_bound <= number_of_colors_used
+
+
+# without time limit the result is optimal, compared with brute force on small graphs
+for seed in range(60):
+    n, p = 6 + seed % 7, [0.2, 0.4, 0.6, 0.8][seed % 4]
+    G = nx.gnp_random_graph(n, p, seed=seed)
+    chromatic = chromatic_number(G)
+    for processes in [1, 2]:
+        coloring, number_of_colors_used, lower_bound = exact_coloring(
+            G, time_limit=None, processes=processes
+        )
+        name = f"exact_coloring of G({n}, {p}) seed {seed} on {processes} processes"
+        check(G, coloring, number_of_colors_used, lower_bound, name)
+        assert (
+            number_of_colors_used == lower_bound == chromatic
+        ), f"{name} found {number_of_colors_used} colors, chromatic number is {chromatic}"
+
+# graphs whose heuristics are not optimal, so the search has to find better coloring
+# and subtrees split off under the old bound are skipped
+for seed in range(5):
+    G = nx.gnp_random_graph(40, 0.3, seed=seed)
+    for processes in [1, 2]:
+        coloring, number_of_colors_used, lower_bound = exact_coloring(
+            G, time_limit=None, processes=processes
+        )
+        check(G, coloring, number_of_colors_used, lower_bound, "exact_coloring")
+        assert number_of_colors_used == lower_bound
+
+# known chromatic numbers
+for G, chromatic in [
+    (nx.complete_graph(7), 7),
+    (nx.cycle_graph(9), 3),
+    (nx.petersen_graph(), 3),
+    (nx.mycielski_graph(5), 5),
+]:
+    coloring, number_of_colors_used, lower_bound = exact_coloring(G, processes=1)
+    check(G, coloring, number_of_colors_used, lower_bound, "exact_coloring")
+    assert number_of_colors_used == lower_bound == chromatic
+
+# nodes that are not 0..n-1 keep their names, graph.Graph is colored by nodes 0..n-1
+G = nx.relabel_nodes(nx.gnp_random_graph(12, 0.5, seed=2137), lambda node: f"node {node}")
+coloring, number_of_colors_used, lower_bound = exact_coloring(G, processes=1)
+check(G, coloring, number_of_colors_used, lower_bound, "exact_coloring")
+graph = Graph.from_networkx(G)
+coloring, _, _ = exact_coloring(graph, processes=1)
+assert set(coloring) == set(range(len(graph)))
+
+assert exact_coloring(nx.Graph()) == ({}, 0, 0)
+
+# wrapper runs it like other coloring functions, searched subtrees are traced
+G = nx.gnp_random_graph(40, 0.3, seed=1)  # heuristics are not optimal on it
+coloring, number_of_colors_used, _, timing_dict = wrapper(exact_coloring, G, report=False)
+check(G, coloring, number_of_colors_used, 0, "wrapper of exact_coloring")
+assert len(timing_dict["coloring"].events()[0]) > 0
+
+# with time limit the best coloring found so far is returned, bounds stay valid
+G = nx.gnp_random_graph(90, 0.5, seed=2137)
+coloring, number_of_colors_used, lower_bound = exact_coloring(
+    G, time_limit=0.5, processes=1
+)
+check(G, coloring, number_of_colors_used, lower_bound, "exact_coloring with time limit")
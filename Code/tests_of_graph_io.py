@@ -0,0 +1,72 @@
+import os
+import tempfile
+import networkx as nx
+import numpy as np
+from graph import Graph
+from graph_io import load_edge_list, write_binary_edge_list
+
+
+def same_graph(graph, expected, name):
+    assert len(graph) == len(expected), f"{name} has wrong number of nodes"
+    assert np.array_equal(graph.offsets, expected.offsets), f"{name} has wrong offsets"
+    assert np.array_equal(graph.adjacency, expected.adjacency), f"{name} has wrong adjacency"
+
+
+with tempfile.TemporaryDirectory() as directory:
+    for seed, (n, p) in enumerate([(1, 0.0), (50, 0.1), (300, 0.05), (1000, 0.01)]):
+        G = nx.gnp_random_graph(n, p, seed=seed)
+        edges = list(G.edges())
+        # repeated edges (in both directions) and self loops are dropped
+        noisy_edges = edges + [(v, u) for u, v in edges[::3]] + [(0, 0), (n - 1, n - 1)]
+        expected = Graph.from_edge_list(edges, n)
+        assert sorted(expected.edges()) == sorted(tuple(sorted(edge)) for edge in edges)
+
+        text_path = os.path.join(directory, f"graph_{seed}.txt")
+        with open(text_path, "w") as file:
+            file.write("# comment line\n% another comment\n")
+            for i, (u, v) in enumerate(noisy_edges):
+                # further columns (weights) are ignored
+                file.write(f"{u} {v}\n" if i % 2 else f"{u} {v} 1.5\n")
+            file.write(f"{n - 1} {n - 1}\n")  # biggest node only in a self loop
+        binary_path = os.path.join(directory, f"graph_{seed}.bin")
+        write_binary_edge_list(noisy_edges, binary_path)
+
+        for path in [text_path, binary_path]:
+            # small chunks, so files are read in many pieces (some of comments only)
+            for chunk_edges in [1, 7, 1 << 20]:
+                name = f"{os.path.basename(path)} in chunks of {chunk_edges} edges"
+                same_graph(load_edge_list(path, chunk_edges=chunk_edges), expected, name)
+
+            # arrays built in memory-mapped files can be opened again without parsing
+            graph_directory = os.path.join(directory, os.path.basename(path) + ".graph")
+            graph = load_edge_list(path, directory=graph_directory, chunk_edges=5)
+            same_graph(graph, expected, f"memory-mapped {os.path.basename(path)}")
+            assert isinstance(graph.adjacency, np.memmap)
+            assert sorted(os.listdir(graph_directory)) == ["adjacency.npy", "offsets.npy"]
+            same_graph(Graph.load(graph_directory), expected, "reopened graph")
+            same_graph(Graph.load(graph_directory, mmap=False), expected, "read graph")
+            del graph
+
+        # format is guessed from extension, but can be given
+        copy_path = os.path.join(directory, f"graph_{seed}.edges")
+        write_binary_edge_list(noisy_edges, copy_path)
+        same_graph(load_edge_list(copy_path, binary=True), expected, "binary without .bin")
+
+    # empty files (also memory-mapped) give graph without nodes
+    empty = Graph.from_edge_list([], 0)
+    for name in ["empty.txt", "empty.bin"]:
+        path = os.path.join(directory, name)
+        open(path, "w").close()
+        same_graph(load_edge_list(path), empty, name)
+        graph = load_edge_list(path, directory=os.path.join(directory, name + ".graph"))
+        same_graph(graph, empty, f"memory-mapped {name}")
+        del graph
+
+    # graph saved with Graph.save is the same after load, labels included
+    G = nx.relabel_nodes(nx.gnp_random_graph(100, 0.1, seed=2137), lambda node: f"n{node}")
+    graph = Graph.from_networkx(G)
+    graph.save(os.path.join(directory, "saved"))
+    loaded = Graph.load(os.path.join(directory, "saved"))
+    same_graph(loaded, graph, "saved graph")
+    assert loaded.labels == graph.labels
+    assert nx.utils.graphs_equal(loaded.to_networkx(), G)
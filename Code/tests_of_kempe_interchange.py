@@ -0,0 +1,51 @@
+import random
+from time import perf_counter
+import networkx as nx
+from coloring_algorithms import KempeInterchange
+from coloring_algorithms import random_sequential_with_interchange
+from coloring_algorithms import largest_first_with_interchange
+from coloring_algorithms import d_satur_with_interchange
+from graph_factory import generate
+
+# compare default interchange with Kempe chains on sparse graphs, where chains are short
+number_of_repetitions = 5
+graphs = {
+    "G(2000, 5/n)": nx.gnp_random_graph(2000, 5 / 2000, seed=1),
+    "G(2000, 20/n)": nx.gnp_random_graph(2000, 20 / 2000, seed=1),
+    "G(500, 0.1)": nx.gnp_random_graph(500, 0.1, seed=1),
+    "planar mesh": nx.Graph(generate("planar_mesh", 5000, seed=1).edges()),
+    "6-regular": nx.random_regular_graph(6, 2000, seed=1),
+}
+algorithms = [
+    random_sequential_with_interchange,
+    largest_first_with_interchange,
+    d_satur_with_interchange,
+]
+
+total_default = 0
+total_kempe = 0
+for name, G in graphs.items():
+    for coloring_func in algorithms:
+        results = []
+        for interchange in [None, KempeInterchange()]:
+            colors = 0
+            start = perf_counter()
+            for seed in range(number_of_repetitions):
+                random.seed(seed)
+                coloring, number_of_colors_used = coloring_func(G, interchange=interchange)
+                for edge in G.edges():
+                    assert (
+                        coloring[edge[0]] != coloring[edge[1]]
+                    ), f"{coloring_func.__name__} created invalid coloring"
+                colors += number_of_colors_used
+            results.append((colors / number_of_repetitions, perf_counter() - start))
+        (default_colors, default_time), (kempe_colors, kempe_time) = results
+        total_default += default_colors
+        total_kempe += kempe_colors
+        print(
+            f"{name}, {coloring_func.__name__}: default {default_colors:.1f} colors "
+            f"{default_time:.3f}s, Kempe {kempe_colors:.1f} colors {kempe_time:.3f}s"
+        )
+
+assert total_kempe < total_default, "Kempe chains did not reduce number of colors"
+print(f"sum of average colors, default: {total_default:.1f}, Kempe: {total_kempe:.1f}")
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import numpy as np
+from graph import Graph
+from graph_factory import generate
+from out_of_core import out_of_core_largest_first, out_of_core_smallest_last
+from out_of_core import out_of_core_random_sequential
+from coloring_algorithms import largest_first, smallest_last
+
+
+def check(graph, coloring, number_of_colors_used, name):
+    assert len(coloring) == len(graph), f"{name} left nodes without color"
+    colors = np.asarray(coloring.colors)
+    rows = np.repeat(np.arange(len(graph)), graph.degree())
+    assert not (
+        colors[rows] == colors[graph.adjacency]
+    ).any(), f"{name} created invalid coloring, two adjacent nodes have the same color"
+    assert colors.min(initial=1) >= 1 and number_of_colors_used == colors.max(initial=0)
+
+
+# memory limits from blocks of a few nodes (smallest_last arrays in files) to all in memory
+memory_limits = [1000, 64 * 1024, 256 * 2**20]
+graphs = [
+    generate("gnp", 2000, p=0.005, seed=2137, cache_directory=None),
+    generate("gnp", 500, p=0.3, seed=2137, cache_directory=None),
+    generate("power_law", 3000, average_degree=6, seed=2137, cache_directory=None),
+    Graph.from_edge_list([(0, 1), (1, 2)], 5),  # isolated nodes
+]
+
+with tempfile.TemporaryDirectory() as directory:
+    for i, graph in enumerate(graphs):
+        graph_directory = os.path.join(directory, str(i))
+        graph.save(graph_directory)
+        graph = Graph.load(graph_directory)
+        in_memory = Graph.load(graph_directory, mmap=False)
+
+        for memory_limit in memory_limits:
+            # largest_first and smallest_last color exactly like in memory
+            for function, expected_function in [
+                (out_of_core_largest_first, largest_first),
+                (out_of_core_smallest_last, smallest_last),
+            ]:
+                name = f"{function.__name__} of graph {i} with memory_limit {memory_limit}"
+                coloring, number_of_colors_used = function(
+                    graph_directory, memory_limit=memory_limit
+                )
+                check(graph, coloring, number_of_colors_used, name)
+                expected, expected_number_of_colors = expected_function(in_memory)
+                assert number_of_colors_used == expected_number_of_colors, name
+                assert all(
+                    coloring[node] == expected[node] for node in range(len(graph))
+                ), f"{name} differs from coloring in memory"
+
+            # random_sequential gives the same coloring for the same seed only
+            name = f"out_of_core_random_sequential of graph {i}"
+            first, number_of_colors_used = out_of_core_random_sequential(
+                graph, memory_limit=memory_limit, seed=1
+            )
+            check(graph, first, number_of_colors_used, name)
+            second, _ = out_of_core_random_sequential(graph, memory_limit=memory_limit, seed=1)
+            assert np.array_equal(first.colors, second.colors), name
+            del first, second, coloring
+
+        # working files are removed, only the saved graph stays in its directory
+        assert sorted(os.listdir(graph_directory)) == ["adjacency.npy", "offsets.npy"]
+
+    # results of calls on the same directory do not share files
+    graph_directory = os.path.join(directory, "0")
+    first, _ = out_of_core_largest_first(graph_directory)
+    colors = np.array(first.colors)
+    second, _ = out_of_core_random_sequential(graph_directory, seed=5)
+    assert np.array_equal(first.colors, colors), "second call changed the first result"
+    assert not np.array_equal(first.colors, second.colors)
+    del first, second
+
+# graph.Graph is colored by nodes 0..n-1, labels it keeps are not applied
+graph = Graph.from_csr(np.array([0, 1, 2]), np.array([1, 0], dtype=np.int32), ["a", "b"])
+coloring, number_of_colors_used = out_of_core_largest_first(graph)
+assert dict(coloring) == {0: 1, 1: 2} and number_of_colors_used == 2
@@ -0,0 +1,94 @@
+import networkx as nx
+from graph import Graph
+from graph_factory import generate
+from coloring_algorithms import d_satur
+from planar_coloring import planar_coloring, five_coloring
+
+
+def faces(G):
+    # faces of planar embedding of triangulation, every face once
+    _, embedding = nx.check_planarity(G)
+    seen = set()
+    for u, v in embedding.edges():
+        if (u, v) not in seen:
+            face = embedding.traverse_face(u, v, mark_half_edges=seen)
+            yield tuple(face)
+
+
+def subdivided_icosahedron(times):
+    """
+    Triangulation made from icosahedron by splitting every triangle into four
+    times times, 12 nodes have degree 5 and the others degree 6, so no node
+    has degree <= 4 and five_coloring has to contract neighbors.
+    """
+    G = nx.icosahedral_graph()
+    triangles = list(faces(G))
+    for _ in range(times):
+        middles = {}
+
+        def middle(u, v):
+            edge = (min(u, v), max(u, v))
+            if edge not in middles:
+                middles[edge] = len(G) + len(middles)
+            return middles[edge]
+
+        new_triangles = []
+        for a, b, c in triangles:
+            ab, bc, ca = middle(a, b), middle(b, c), middle(c, a)
+            new_triangles += [(a, ab, ca), (b, bc, ab), (c, ca, bc), (ab, bc, ca)]
+        G = nx.Graph()
+        for a, b, c in new_triangles:
+            G.add_edges_from([(a, b), (b, c), (c, a)])
+        triangles = new_triangles
+    return G
+
+
+def check(G, coloring, number_of_colors_used, name, most_colors):
+    assert set(coloring) == set(G), f"{name} left nodes without color"
+    for edge in G.edges():
+        assert (
+            coloring[edge[0]] != coloring[edge[1]]
+        ), f"{name} created invalid coloring, two adjacent nodes have the same color"
+    assert number_of_colors_used == max(coloring.values(), default=0)
+    assert number_of_colors_used <= most_colors, f"{name} used {number_of_colors_used} colors"
+
+
+# triangulations with minimum degree 5, up to 2562 nodes
+for times in range(5):
+    G = subdivided_icosahedron(times)
+    assert min(degree for _, degree in G.degree()) == 5
+    assert G.number_of_edges() == 3 * len(G) - 6
+    graph = Graph.from_networkx(G)
+    colors = five_coloring(graph)
+    assert max(colors) <= 5 and all(colors[u] != colors[v] for u, v in graph.edges())
+    for planar in [None, True, "check"]:
+        name = f"planar_coloring of {len(G)} node icosahedron, planar={planar}"
+        coloring, number_of_colors_used = planar_coloring(G, five_colors=True, planar=planar)
+        check(G, coloring, number_of_colors_used, name, 5)
+        coloring, number_of_colors_used = planar_coloring(G, planar=planar)
+        check(G, coloring, number_of_colors_used, name, 6)
+
+# meshes and graphs with names of nodes or given as graph.Graph
+for G in [
+    generate("planar_mesh", 2500, seed=2137, cache_directory=None).to_networkx(),
+    nx.relabel_nodes(subdivided_icosahedron(2), lambda node: f"node {node}"),
+    nx.random_labeled_tree(300, seed=2137),
+]:
+    for H in [G, Graph.from_networkx(G)]:
+        coloring, number_of_colors_used = planar_coloring(H, five_colors=True)
+        check(H, coloring, number_of_colors_used, "planar_coloring", 5)
+        coloring, number_of_colors_used = planar_coloring(H)
+        check(H, coloring, number_of_colors_used, "planar_coloring", 6)
+
+# graphs that are not planar are colored with d_satur
+for G in [nx.complete_graph(7), nx.complete_graph(12)]:
+    expected = d_satur(G)
+    for planar in [None, "check", False]:
+        for five_colors in [False, True]:
+            result = planar_coloring(G, five_colors=five_colors, planar=planar)
+            assert result == expected, f"K{len(G)} was not colored with d_satur"
+# K3,3 passes cheap filters (few edges, degeneracy 3), its coloring is still proper
+G = nx.complete_bipartite_graph(3, 3)
+coloring, number_of_colors_used = planar_coloring(G, five_colors=True)
+check(G, coloring, number_of_colors_used, "planar_coloring of K3,3", 5)
+assert planar_coloring(G, planar="check") == d_satur(G)
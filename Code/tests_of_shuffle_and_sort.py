@@ -1,6 +1,6 @@
 import random
 from time import perf_counter
-import networkx as nx
+from graph_factory import generate
 import matplotlib.pyplot as plt
 
 # test shuffle
@@ -9,7 +9,9 @@ graph_sizes = list(range(50, 3000, 50))
 times = []
 for i in graph_sizes:
     list_of_graphs = [
-        nx.erdos_renyi_graph(i, 0.5) for _ in range(number_of_repetitions)
+        # networkx graphs, as in coloring algorithms, generated without disk cache
+        generate("gnp", i, p=0.5, seed=seed, cache_directory=None).to_networkx()
+        for seed in range(number_of_repetitions)
     ]
     start = perf_counter()
     for i in range(number_of_repetitions):
@@ -37,7 +39,9 @@ graph_sizes = list(range(50, 3000, 50))
 times = []
 for i in graph_sizes:
     list_of_graphs = [
-        nx.erdos_renyi_graph(i, 0.5) for _ in range(number_of_repetitions)
+        # networkx graphs, as in coloring algorithms, generated without disk cache
+        generate("gnp", i, p=0.5, seed=seed, cache_directory=None).to_networkx()
+        for seed in range(number_of_repetitions)
     ]
     start = perf_counter()
     for i in range(number_of_repetitions):
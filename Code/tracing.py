@@ -0,0 +1,63 @@
+from array import array
+from time import perf_counter
+import numpy as np
+
+# kinds of events
+NODE = 0  # node is about to be colored
+INTERCHANGE_START = 1  # new color is needed, interchange is attempted
+INTERCHANGE_FAILED = 2  # interchange ended and new color was used
+INTERCHANGE_SUCCEEDED = 3  # interchange ended and no new color was needed
+
+
+class Trace:
+    """
+    Event sink passed to coloring algorithms as trace argument.
+    Events are kept in preallocated typed arrays (step, time, kind) instead of lists,
+    with every > 1 only every k-th node is recorded (interchange events always are).
+    """
+
+    __slots__ = ["every", "size", "steps", "times", "kinds"]
+
+    def __init__(self, number_of_nodes=0, every=1) -> None:
+        self.every = every
+        self.size = 0  # number of recorded events
+        capacity = number_of_nodes // every + 1
+        self.steps = array("q", bytes(8 * capacity))
+        self.times = array("d", bytes(8 * capacity))
+        self.kinds = array("b", bytes(capacity))
+
+    def node(self, step):
+        if step % self.every == 0:
+            self._record(step, NODE)
+
+    def interchange_start(self, step):
+        self._record(step, INTERCHANGE_START)
+
+    def interchange_end(self, step, succeeded):
+        self._record(step, INTERCHANGE_SUCCEEDED if succeeded else INTERCHANGE_FAILED)
+
+    def _record(self, step, kind):
+        time = perf_counter()
+        if self.size == len(self.steps):  # buffers are full, double them
+            self.steps.extend(self.steps)
+            self.times.extend(self.times)
+            self.kinds.extend(self.kinds)
+        self.steps[self.size] = step
+        self.times[self.size] = time
+        self.kinds[self.size] = kind
+        self.size += 1
+
+    def shift_times(self, start):
+        """
+        Makes times relative to start.
+        """
+        np.frombuffer(self.times)[: self.size] -= start
+
+    def events(self, kind=NODE):
+        """
+        Returns arrays of steps and times of all recorded events of given kind.
+        """
+        steps = np.frombuffer(self.steps, dtype=np.int64)[: self.size]
+        times = np.frombuffer(self.times)[: self.size]
+        is_kind = np.frombuffer(self.kinds, dtype=np.int8)[: self.size] == kind
+        return steps[is_kind], times[is_kind]
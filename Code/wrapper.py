@@ -1,27 +1,58 @@
 from networkx import Graph
 from time import perf_counter
+from tracing import Trace
+from lower_bounds import lower_bound as chromatic_lower_bound, optimality_gap
 
 
-def wrapper(coloring_func, G: Graph, report=True):
+def wrapper(
+    coloring_func, G: Graph, report=True, trace_every=1, cache=None, lower_bound=False
+):
     """
     A wrapper function for coloring algorithms.
     Returns a dictionary of colors for each node and the number of used colors.
+    Progress of coloring is recorded in timing_dict["coloring"] (tracing.Trace with
+    times relative to start), only every trace_every-th node is recorded,
+    trace_every=None disables tracing.
+    With cache (coloring_cache.ColoringCache) results are taken from it when possible,
+    such runs are not traced and coloring is relabeling.CompactColoring (read only
+    Mapping of node to color, not a dict).
+    With lower_bound=True optimality gap of the result is kept in timing_dict["gap"],
+    relative to lower bound on chromatic number (timing_dict["lower_bound"]), which is
+    computed with lower_bounds.lower_bound outside of measured time (it often takes
+    longer than coloring), lower_bound can also be a bound known before.
+    With lower_bound=False (the default) both are None.
     """
 
+    trace = Trace(len(G), trace_every) if trace_every and cache is None else None
+
     timing_dict = {}
     timing_dict["start"] = perf_counter()
-    coloring, number_of_color_used, timing_dict = coloring_func(G, timing_dict)
+    if cache is not None:
+        coloring, number_of_color_used = cache.color(coloring_func, G)
+    else:
+        # results after the first two (like lower bound of exact_coloring) are dropped
+        coloring, number_of_color_used = coloring_func(G, trace=trace)[:2]
     timing_dict["stop"] = perf_counter()
 
     time = timing_dict["stop"] - timing_dict["start"]
-    timing_list = timing_dict["coloring"]
-    for i, t in enumerate(timing_list):
-        timing_list[i][1] = t[1] - timing_dict["start"]
-    timing_dict["coloring"] = timing_list
+    if trace is not None:
+        trace.shift_times(timing_dict["start"])
+    timing_dict["coloring"] = trace
+
+    if lower_bound is True:
+        lower_bound = chromatic_lower_bound(G)
+    elif lower_bound is False:
+        lower_bound = None
+    timing_dict["lower_bound"] = lower_bound
+    timing_dict["gap"] = None
+    if lower_bound is not None:
+        timing_dict["gap"] = optimality_gap(number_of_color_used, lower_bound)
 
     if report:
         print(f"Time taken: {time:.3f}s, coloring function: {coloring_func.__name__}")
         print(f"color used: {number_of_color_used}, number of nodes: {len(G)}")
+        if lower_bound is not None:
+            print(f"lower bound: {lower_bound}, optimality gap: {timing_dict['gap']:.1%}")
         print("")
 
     return coloring, number_of_color_used, time, timing_dict